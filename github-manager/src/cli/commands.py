@@ -32,10 +32,12 @@ def list_repos(ctx):
         manager = GitHubRepoManager(ctx.obj['config'])
         await manager.initialize()
         
-        repos = manager.scan_local_repositories()
+        # initialize() has just scanned the local repositories
+        repos = manager.local_repos
         
         if not repos:
             click.echo("No repositories found")
+            await manager.cleanup()
             return
         
         # Format for display
@@ -107,12 +109,13 @@ def ai_command(ctx, command, repo):
         if repo:
             prompt += f"\nRepository: {repo}"
         
+        click.echo()
         result = await manager.ollama.analyze_code_with_tools(
             repo or ".", 
-            prompt
+            prompt,
+            on_token=lambda token: click.echo(token, nl=False)
         )
-        
-        click.echo(f"\n{result['analysis']}")
+        click.echo()
         
         if result['tool_calls_made'] > 0:
             click.echo(f"\nTools used: {', '.join(result['tools_used'])}")
@@ -320,8 +323,10 @@ Available commands:
                     """)
                 elif command.startswith('ai '):
                     ai_cmd = command[3:]
-                    result = await manager.ollama.analyze_code_with_tools(".", ai_cmd)
-                    click.echo(result['analysis'])
+                    await manager.ollama.analyze_code_with_tools(
+                        ".", ai_cmd, on_token=lambda token: click.echo(token, nl=False)
+                    )
+                    click.echo()
                 else:
                     # Parse and execute command
                     parts = command.split()
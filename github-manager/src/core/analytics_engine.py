@@ -20,15 +20,72 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 from collections import defaultdict, Counter
 import re
+import tomllib
+from xml.etree import ElementTree
 from textblob import TextBlob
 import aiofiles
-import hashlib
 from jinja2 import Template
+from functools import lru_cache
+import git
 import logging
 
+from ..utils.hashing import fast_hash
+
 logger = logging.getLogger(__name__)
 
 
+# Bump when metric calculations change so cached results are recomputed
+METRICS_CACHE_VERSION = 1
+
+CODE_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.rs', '.java',
+    '.cpp', '.c', '.h', '.hpp', '.cs', '.rb', '.php', '.swift'
+})
+DOC_EXTENSIONS = frozenset({'.md', '.rst', '.txt', '.adoc'})
+TEST_PATTERNS = ('test_', '_test', '.test.', '.spec.', 'tests/', 'test/')
+DOC_PATTERNS = ('readme', 'changelog', 'contributing', 'docs/')
+
+# Decision points for the cyclomatic complexity estimate, fused so a file is
+# scanned once instead of once per keyword
+DECISION_POINT_RE = re.compile(r'\b(?:if|else|elif|for|while|case|catch|try)\b')
+
+# Performance indicators in priority order, matched case-insensitively so the
+# file contents don't need a lowercased copy
+PERF_INDICATORS = tuple(
+    (re.compile(re.escape(indicator), re.IGNORECASE), points)
+    for indicator, points in (
+        ('async', 5),
+        ('await', 5),
+        ('concurrent', 3),
+        ('parallel', 3),
+        ('cache', 4),
+        ('memo', 4),
+        ('optimize', 2)
+    )
+)
+
+
+# Path classification is pure, and the same paths are classified by
+# several metric passes over a repository, so memoize on the path string
+@lru_cache(maxsize=8192)
+def _is_test_path(path: str) -> bool:
+    lowered = path.lower()
+    return any(pattern in lowered for pattern in TEST_PATTERNS)
+
+
+@lru_cache(maxsize=8192)
+def _is_doc_path(path: str) -> bool:
+    lowered = path.lower()
+    return any(pattern in lowered for pattern in DOC_PATTERNS)
+
+
+def _block_digests(content: str, block_lines: int = 10) -> List[str]:
+    """Fingerprint each non-blank block of `block_lines` lines (simplified clone detection)"""
+    lines = content.split('\n')
+    blocks = ('\n'.join(lines[i:i + block_lines]) for i in range(0, len(lines), block_lines))
+    return [fast_hash(block.encode()) for block in blocks if block.strip()]
+
+
 @dataclass
 class CodeMetrics:
     """Code quality metrics"""
@@ -77,7 +134,8 @@ class DeveloperMetrics:
 class MetricsCalculator:
     """Calculate various code and repository metrics"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir or Path('~/.cache/github-manager/code_metrics').expanduser()
         self.language_weights = {
             'Python': 1.0,
             'JavaScript': 1.1,
@@ -88,7 +146,39 @@ class MetricsCalculator:
         }
     
     async def calculate_code_metrics(self, repo_path: Path) -> CodeMetrics:
-        """Calculate comprehensive code metrics"""
+        """Calculate comprehensive code metrics, reusing results for an unchanged commit"""
+        key = await asyncio.to_thread(self._metrics_cache_key, repo_path)
+        if key is None:
+            return await self._compute_code_metrics(repo_path)
+        
+        cache_file = self.cache_dir / f"{key}.json"
+        try:
+            async with aiofiles.open(cache_file, 'r') as f:
+                return CodeMetrics(**json.loads(await f.read()))
+        except (OSError, ValueError, TypeError):
+            pass
+        
+        code_metrics = await self._compute_code_metrics(repo_path)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(cache_file, 'w') as f:
+                await f.write(json.dumps(asdict(code_metrics)))
+        except OSError as e:
+            logger.warning(f"Failed to cache code metrics for {repo_path}: {e}")
+        return code_metrics
+    
+    def _metrics_cache_key(self, repo_path: Path) -> Optional[str]:
+        """Key for a clean checkout's HEAD commit; None when results can't be reused"""
+        try:
+            repo = git.Repo(repo_path)
+            if repo.is_dirty(untracked_files=True):
+                return None
+            sha = repo.head.commit.hexsha
+        except Exception:
+            return None
+        return fast_hash(f"{sha}\0{METRICS_CACHE_VERSION}".encode())
+    
+    async def _compute_code_metrics(self, repo_path: Path) -> CodeMetrics:
         metrics = {
             'lines_of_code': 0,
             'cyclomatic_complexity': 0,
@@ -97,18 +187,19 @@ class MetricsCalculator:
             'doc_files': 0
         }
         
+        code_files = await asyncio.to_thread(self._code_files, repo_path)
+        
         # Analyze all files
-        for file_path in repo_path.rglob('*'):
-            if file_path.is_file() and self._is_code_file(file_path):
-                file_metrics = await self._analyze_file(file_path)
-                metrics['lines_of_code'] += file_metrics['loc']
-                metrics['cyclomatic_complexity'] += file_metrics['complexity']
-                metrics['file_count'] += 1
-                
-                if self._is_test_file(file_path):
-                    metrics['test_files'] += 1
-                elif self._is_doc_file(file_path):
-                    metrics['doc_files'] += 1
+        for file_path in code_files:
+            file_metrics = await self._analyze_file(file_path)
+            metrics['lines_of_code'] += file_metrics['loc']
+            metrics['cyclomatic_complexity'] += file_metrics['complexity']
+            metrics['file_count'] += 1
+            
+            if self._is_test_file(file_path):
+                metrics['test_files'] += 1
+            elif self._is_doc_file(file_path):
+                metrics['doc_files'] += 1
         
         # Calculate derived metrics
         avg_complexity = metrics['cyclomatic_complexity'] / max(metrics['file_count'], 1)
@@ -134,12 +225,29 @@ class MetricsCalculator:
             technical_debt_hours=tech_debt,
             test_coverage=test_coverage,
             documentation_coverage=doc_coverage,
-            code_duplication_ratio=await self._calculate_duplication_ratio(repo_path),
+            code_duplication_ratio=await self._calculate_duplication_ratio(code_files),
             dependency_count=await self._count_dependencies(repo_path),
-            security_score=await self._calculate_security_score(repo_path),
-            performance_score=await self._calculate_performance_score(repo_path)
+            security_score=await self._calculate_security_score(repo_path, code_files),
+            performance_score=await self._calculate_performance_score(code_files)
         )
     
+    def _code_files(self, repo_path: Path) -> List[Path]:
+        """Code files to analyze, leaving out anything git ignores
+        
+        In a clean checkout these are exactly the files tracked at HEAD, so
+        metrics cached under that commit can't go stale when ignored trees
+        (build output, vendored dependencies) change.
+        """
+        try:
+            repo = git.Repo(repo_path)
+            names = repo.git.ls_files('--cached', '--others', '--exclude-standard', '-z')
+            candidates = (repo_path / name for name in names.split('\0') if name)
+        except Exception:
+            candidates = repo_path.rglob('*')
+        # Suffix test first: it is far cheaper than the stat() behind is_file()
+        # and rejects most paths
+        return [p for p in candidates if self._is_code_file(p) and p.is_file()]
+    
     async def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze individual file metrics"""
         metrics = {'loc': 0, 'complexity': 1}
@@ -157,13 +265,7 @@ class MetricsCalculator:
                 
                 # Estimate cyclomatic complexity
                 # Count decision points
-                complexity_patterns = [
-                    r'\bif\b', r'\belse\b', r'\belif\b', r'\bfor\b', 
-                    r'\bwhile\b', r'\bcase\b', r'\bcatch\b', r'\btry\b'
-                ]
-                
-                for pattern in complexity_patterns:
-                    metrics['complexity'] += len(re.findall(pattern, content))
+                metrics['complexity'] += len(DECISION_POINT_RE.findall(content))
                 
         except Exception as e:
             logger.error(f"Error analyzing file {file_path}: {e}")
@@ -172,46 +274,32 @@ class MetricsCalculator:
     
     def _is_code_file(self, file_path: Path) -> bool:
         """Check if file is a code file"""
-        code_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.rs', '.java', 
-            '.cpp', '.c', '.h', '.hpp', '.cs', '.rb', '.php', '.swift'
-        }
-        return file_path.suffix in code_extensions
+        return file_path.suffix in CODE_EXTENSIONS
     
     def _is_test_file(self, file_path: Path) -> bool:
         """Check if file is a test file"""
-        test_patterns = ['test_', '_test', '.test.', '.spec.', 'tests/', 'test/']
-        return any(pattern in str(file_path).lower() for pattern in test_patterns)
+        return _is_test_path(str(file_path))
     
     def _is_doc_file(self, file_path: Path) -> bool:
         """Check if file is documentation"""
-        doc_extensions = {'.md', '.rst', '.txt', '.adoc'}
-        doc_patterns = ['readme', 'changelog', 'contributing', 'docs/']
-        
-        return (file_path.suffix in doc_extensions or 
-                any(pattern in str(file_path).lower() for pattern in doc_patterns))
+        return file_path.suffix in DOC_EXTENSIONS or _is_doc_path(str(file_path))
     
-    async def _calculate_duplication_ratio(self, repo_path: Path) -> float:
+    async def _calculate_duplication_ratio(self, code_files: List[Path]) -> float:
         """Calculate code duplication ratio"""
         # Simplified duplication detection
-        hash_counts = defaultdict(int)
+        hash_counts = Counter()
         total_blocks = 0
         
-        for file_path in repo_path.rglob('*'):
-            if file_path.is_file() and self._is_code_file(file_path):
-                try:
-                    async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = await f.read()
-                        # Hash code blocks (simplified - every 10 lines)
-                        lines = content.split('\n')
-                        for i in range(0, len(lines), 10):
-                            block = '\n'.join(lines[i:i+10])
-                            if block.strip():
-                                block_hash = hashlib.md5(block.encode()).hexdigest()
-                                hash_counts[block_hash] += 1
-                                total_blocks += 1
-                except:
-                    pass
+        for file_path in code_files:
+            try:
+                async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = await f.read()
+                # Hash all of the file's blocks in one batch
+                digests = _block_digests(content)
+                hash_counts.update(digests)
+                total_blocks += len(digests)
+            except:
+                pass
         
         # Calculate duplication ratio
         duplicated_blocks = sum(1 for count in hash_counts.values() if count > 1)
@@ -219,8 +307,6 @@ class MetricsCalculator:
     
     async def _count_dependencies(self, repo_path: Path) -> int:
         """Count project dependencies"""
-        dep_count = 0
-        
         # Check various dependency files
         dep_files = {
             'requirements.txt': self._count_python_deps,
@@ -230,12 +316,13 @@ class MetricsCalculator:
             'pom.xml': self._count_maven_deps
         }
         
-        for dep_file, counter in dep_files.items():
-            file_path = repo_path / dep_file
-            if file_path.exists():
-                dep_count += await counter(file_path)
-        
-        return dep_count
+        # Counters are independent, so read the manifests concurrently
+        counts = await asyncio.gather(*(
+            counter(repo_path / dep_file)
+            for dep_file, counter in dep_files.items()
+            if (repo_path / dep_file).exists()
+        ))
+        return sum(counts)
     
     async def _count_python_deps(self, file_path: Path) -> int:
         """Count Python dependencies"""
@@ -262,21 +349,12 @@ class MetricsCalculator:
     
     async def _count_cargo_deps(self, file_path: Path) -> int:
         """Count Cargo dependencies"""
-        # Simplified - would use toml parser in production
-        count = 0
         try:
             async with aiofiles.open(file_path, 'r') as f:
-                in_deps = False
-                async for line in f:
-                    if '[dependencies]' in line:
-                        in_deps = True
-                    elif line.startswith('[') and in_deps:
-                        break
-                    elif in_deps and '=' in line:
-                        count += 1
+                manifest = tomllib.loads(await f.read())
+            return len(manifest.get('dependencies', {}))
         except:
-            pass
-        return count
+            return 0
     
     async def _count_go_deps(self, file_path: Path) -> int:
         """Count Go dependencies"""
@@ -292,17 +370,23 @@ class MetricsCalculator:
     
     async def _count_maven_deps(self, file_path: Path) -> int:
         """Count Maven dependencies"""
-        # Simplified - would use XML parser in production
-        count = 0
         try:
-            async with aiofiles.open(file_path, 'r') as f:
-                content = await f.read()
-                count = content.count('<dependency>')
+            return await asyncio.to_thread(self._count_pom_dependencies, file_path)
         except:
-            pass
+            return 0
+    
+    @staticmethod
+    def _count_pom_dependencies(file_path: Path) -> int:
+        # Streamed so large POMs aren't held in memory; matching the local
+        # name handles the Maven namespace and attribute/whitespace variants
+        count = 0
+        for _, elem in ElementTree.iterparse(file_path, events=('end',)):
+            if elem.tag == 'dependency' or elem.tag.endswith('}dependency'):
+                count += 1
+            elem.clear()
         return count
     
-    async def _calculate_security_score(self, repo_path: Path) -> float:
+    async def _calculate_security_score(self, repo_path: Path, code_files: List[Path]) -> float:
         """Calculate security score (0-100)"""
         score = 100
         
@@ -318,46 +402,34 @@ class MetricsCalculator:
             'document.write(', 'innerHTML', 'dangerouslySetInnerHTML'
         ]
         
-        for file_path in repo_path.rglob('*'):
-            if file_path.is_file() and self._is_code_file(file_path):
-                try:
-                    async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = await f.read()
-                        for pattern in vulnerable_patterns:
-                            if pattern in content:
-                                score -= 5
-                                break
-                except:
-                    pass
+        for file_path in code_files:
+            try:
+                async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = await f.read()
+                    for pattern in vulnerable_patterns:
+                        if pattern in content:
+                            score -= 5
+                            break
+            except:
+                pass
         
         return max(0, min(100, score))
     
-    async def _calculate_performance_score(self, repo_path: Path) -> float:
+    async def _calculate_performance_score(self, code_files: List[Path]) -> float:
         """Calculate performance score (0-100)"""
         score = 80  # Base score
         
         # Check for performance optimizations
-        perf_indicators = {
-            'async': 5,
-            'await': 5,
-            'concurrent': 3,
-            'parallel': 3,
-            'cache': 4,
-            'memo': 4,
-            'optimize': 2
-        }
-        
-        for file_path in repo_path.rglob('*'):
-            if file_path.is_file() and self._is_code_file(file_path):
-                try:
-                    async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = await f.read().lower()
-                        for indicator, points in perf_indicators.items():
-                            if indicator in content:
-                                score += points
-                                break
-                except:
-                    pass
+        for file_path in code_files:
+            try:
+                async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = await f.read()
+                    for indicator, points in PERF_INDICATORS:
+                        if indicator.search(content):
+                            score += points
+                            break
+            except:
+                pass
         
         return min(100, score)
 
@@ -3,8 +3,10 @@ Advanced Collaboration and Workflow Automation Hub
 """
 import asyncio
 import json
-from typing import Dict, List, Any, Optional, Set, Callable
-from datetime import datetime, timedelta
+import time
+import orjson
+from typing import Dict, List, Any, Optional, Set, Callable, Tuple, Deque
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
 from pathlib import Path
 import uuid
@@ -12,12 +14,30 @@ from enum import Enum
 import yaml
 import aioredis
 import websockets
-from collections import defaultdict
-import networkx as nx
+from collections import defaultdict, deque, OrderedDict
+from functools import lru_cache
 import logging
 
+from ..utils.hashing import fast_hash
+
 logger = logging.getLogger(__name__)
 
+CHAT_HISTORY_LIMIT = 1000
+REVIEW_CACHE_SIZE = 256
+REVIEW_CACHE_VERSION = 1  # bump when the review output format changes
+WORKFLOW_STATUS_TTL = 7 * 24 * 3600  # seconds to keep completed executions
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware current UTC time"""
+    return datetime.now(timezone.utc)
+
+
+@lru_cache(maxsize=1024)
+def _compile_condition(expression: str):
+    """Compile a step condition once; workflows re-check the same expressions on every run"""
+    return compile(expression, '<condition>', 'eval')
+
 
 class WorkflowStatus(Enum):
     """Workflow execution status"""
@@ -43,7 +63,7 @@ class ActionType(Enum):
     AI_ANALYSIS = "ai_analysis"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowStep:
     """Individual workflow step"""
     id: str
@@ -59,9 +79,10 @@ class WorkflowStep:
     error: Optional[str] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    duration: Optional[float] = None  # seconds, from a monotonic clock
 
 
-@dataclass
+@dataclass(slots=True)
 class Workflow:
     """Complete workflow definition"""
     id: str
@@ -72,9 +93,10 @@ class Workflow:
     variables: Dict[str, Any] = field(default_factory=dict)
     notifications: List[Dict[str, Any]] = field(default_factory=list)
     created_by: str = "system"
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=_utcnow)
     status: WorkflowStatus = WorkflowStatus.PENDING
     execution_id: Optional[str] = None
+    error: Optional[str] = None
 
 
 @dataclass
@@ -88,7 +110,9 @@ class CollaborationSession:
     created_at: datetime
     active: bool = True
     shared_state: Dict[str, Any] = field(default_factory=dict)
-    chat_history: List[Dict[str, Any]] = field(default_factory=list)
+    chat_history: Deque[Dict[str, Any]] = field(
+        default_factory=lambda: deque(maxlen=CHAT_HISTORY_LIMIT)
+    )
     annotations: List[Dict[str, Any]] = field(default_factory=list)
     
     def add_participant(self, user_id: str):
@@ -105,9 +129,10 @@ class CollaborationSession:
 class WorkflowEngine:
     """Workflow execution engine"""
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(self, redis_url: str = "redis://localhost:6379", max_parallel: int = 4):
         self.redis_url = redis_url
         self.redis = None
+        self.max_parallel = max_parallel
         self.workflows = {}
         self.executors = {}
         self.running_workflows = {}
@@ -185,7 +210,7 @@ class WorkflowEngine:
         self.running_workflows[execution_id] = {
             'workflow': workflow,
             'context': context,
-            'started_at': datetime.utcnow()
+            'started_at': _utcnow()
         }
         
         # Execute workflow asynchronously
@@ -196,26 +221,58 @@ class WorkflowEngine:
     async def _run_workflow(self, workflow: Workflow, context: Dict[str, Any]):
         """Run workflow execution"""
         try:
-            # Build execution graph
-            graph = self._build_execution_graph(workflow.steps)
+            # Build dependency index
+            remaining_deps, dependents = self._build_dependency_index(workflow.steps)
+            steps_by_id = {s.id: s for s in workflow.steps}
+            semaphore = asyncio.Semaphore(self.max_parallel)
             
-            # Execute steps in topological order
-            for step_id in nx.topological_sort(graph):
-                step = next(s for s in workflow.steps if s.id == step_id)
-                
-                # Check conditions
-                if not await self._check_conditions(step, context):
-                    step.status = WorkflowStatus.CANCELLED
-                    continue
-                
-                # Execute step
-                await self._execute_step(step, context)
-                
-                # Check if we should continue
-                if step.status == WorkflowStatus.FAILED:
-                    if not step.retry_policy.get('continue_on_failure', False):
-                        workflow.status = WorkflowStatus.FAILED
-                        break
+            async def run_limited(step: WorkflowStep) -> WorkflowStep:
+                async with semaphore:
+                    # Steps queued on the semaphore when the workflow failed or
+                    # was cancelled never start
+                    if workflow.status in (WorkflowStatus.FAILED, WorkflowStatus.CANCELLED):
+                        step.status = WorkflowStatus.CANCELLED
+                        return step
+                    
+                    await self._run_step(step, context)
+                    
+                    # Marked before the semaphore is released, so the next
+                    # queued step already sees the failure
+                    if step.status == WorkflowStatus.FAILED:
+                        if not step.retry_policy.get('continue_on_failure', False):
+                            workflow.status = WorkflowStatus.FAILED
+                return step
+            
+            # Dispatch each step as soon as its last dependency completes; the
+            # semaphore caps how many execute at once
+            pending = {
+                asyncio.create_task(run_limited(steps_by_id[step_id]))
+                for step_id, deps in remaining_deps.items() if not deps
+            }
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    
+                    # One round trip checkpoints every step that just finished
+                    await self._checkpoint_steps(workflow.execution_id, [task.result() for task in done])
+                    
+                    # Steps already running are allowed to finish but nothing
+                    # new is scheduled once the workflow has stopped
+                    if workflow.status in (WorkflowStatus.FAILED, WorkflowStatus.CANCELLED):
+                        continue
+                    
+                    for task in done:
+                        step = task.result()
+                        for dependent_id in dependents[step.id]:
+                            deps = remaining_deps[dependent_id]
+                            deps.discard(step.id)
+                            if not deps:
+                                pending.add(asyncio.create_task(run_limited(steps_by_id[dependent_id])))
+            finally:
+                # A failed checkpoint or a cancelled run must not leave steps
+                # running with nobody waiting on them
+                for task in pending:
+                    task.cancel()
             
             # Set final status
             if workflow.status == WorkflowStatus.RUNNING:
@@ -230,24 +287,75 @@ class WorkflowEngine:
             workflow.error = str(e)
         
         finally:
-            # Cleanup
-            if workflow.execution_id in self.running_workflows:
-                del self.running_workflows[workflow.execution_id]
+            # Persist the final state, then cleanup
+            execution = self.running_workflows.pop(workflow.execution_id, None)
+            if execution is not None:
+                try:
+                    await self._store_final_status(workflow.execution_id, execution)
+                except Exception as e:
+                    logger.error(f"Error storing workflow status: {e}")
     
-    def _build_execution_graph(self, steps: List[WorkflowStep]) -> nx.DiGraph:
-        """Build directed graph for execution order"""
-        graph = nx.DiGraph()
+    async def _checkpoint_steps(self, execution_id: str, steps: List[WorkflowStep]):
+        """Write step checkpoints for an execution in a single pipeline"""
+        if self.redis is None or not steps:
+            return
         
+        pipe = self.redis.pipeline()
         for step in steps:
-            graph.add_node(step.id)
-            for dep in step.dependencies:
-                graph.add_edge(dep, step.id)
+            pipe.hset(f"workflow:{execution_id}:steps", step.id, json.dumps(self._serialize_step(step)))
+        await pipe.execute()
+    
+    async def _store_final_status(self, execution_id: str, execution: Dict[str, Any]):
+        """Store the completed execution and drop its step checkpoints in one pipeline"""
+        if self.redis is None:
+            return
+        
+        pipe = self.redis.pipeline()
+        pipe.set(
+            f"workflow:{execution_id}",
+            json.dumps(self._serialize_execution(execution_id, execution)),
+            expire=WORKFLOW_STATUS_TTL
+        )
+        pipe.delete(f"workflow:{execution_id}:steps")
+        await pipe.execute()
+    
+    async def _run_step(self, step: WorkflowStep, context: Dict[str, Any]):
+        """Check a step's conditions and execute it"""
+        if not await self._check_conditions(step, context):
+            step.status = WorkflowStatus.CANCELLED
+            return
         
-        # Check for cycles
-        if not nx.is_directed_acyclic_graph(graph):
+        await self._execute_step(step, context)
+    
+    def _build_dependency_index(
+        self, steps: List[WorkflowStep]
+    ) -> Tuple[Dict[str, Set[str]], Dict[str, List[str]]]:
+        """Build per-step pending dependencies and the reverse dependents index"""
+        remaining_deps = {step.id: set(step.dependencies) for step in steps}
+        dependents = {step.id: [] for step in steps}
+        
+        for step in steps:
+            for dep in step.dependencies:
+                if dep not in dependents:
+                    raise ValueError(f"Step {step.id} depends on unknown step {dep}")
+                dependents[dep].append(step.id)
+        
+        # Check for cycles (Kahn's algorithm must be able to visit every step)
+        indegree = {step_id: len(deps) for step_id, deps in remaining_deps.items()}
+        queue = deque(step_id for step_id, count in indegree.items() if count == 0)
+        visited = 0
+        while queue:
+            step_id = queue.popleft()
+            visited += 1
+            for dependent_id in dependents[step_id]:
+                indegree[dependent_id] -= 1
+                if indegree[dependent_id] == 0:
+                    queue.append(dependent_id)
+        
+        if visited != len(steps):
             raise ValueError("Workflow contains circular dependencies")
         
-        return graph
+        return remaining_deps, dependents
     
     async def _check_conditions(self, step: WorkflowStep, context: Dict) -> bool:
         """Check if step conditions are met"""
@@ -255,7 +363,7 @@ class WorkflowEngine:
             if condition_type == 'if':
                 # Simple expression evaluation (in production, use safe eval)
                 try:
-                    result = eval(condition_value, {'context': context})
+                    result = eval(_compile_condition(condition_value), {'context': context})
                     if not result:
                         return False
                 except:
@@ -264,7 +372,7 @@ class WorkflowEngine:
             
             elif condition_type == 'unless':
                 try:
-                    result = eval(condition_value, {'context': context})
+                    result = eval(_compile_condition(condition_value), {'context': context})
                     if result:
                         return False
                 except:
@@ -275,7 +383,8 @@ class WorkflowEngine:
     async def _execute_step(self, step: WorkflowStep, context: Dict):
         """Execute individual workflow step"""
         step.status = WorkflowStatus.RUNNING
-        step.started_at = datetime.utcnow()
+        step.started_at = _utcnow()
+        start = time.monotonic()
         
         max_retries = step.retry_policy.get('max_retries', 0)
         retry_delay = step.retry_policy.get('delay', 5)
@@ -309,7 +418,8 @@ class WorkflowEngine:
                     await asyncio.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
         
-        step.completed_at = datetime.utcnow()
+        step.completed_at = _utcnow()
+        step.duration = time.monotonic() - start
     
     async def _execute_code_analysis(self, params: Dict, context: Dict) -> Dict:
         """Execute code analysis action"""
@@ -449,24 +559,7 @@ class WorkflowEngine:
     async def get_workflow_status(self, execution_id: str) -> Dict:
         """Get workflow execution status"""
         if execution_id in self.running_workflows:
-            execution = self.running_workflows[execution_id]
-            workflow = execution['workflow']
-            
-            return {
-                'execution_id': execution_id,
-                'workflow_name': workflow.name,
-                'status': workflow.status.value,
-                'started_at': execution['started_at'].isoformat(),
-                'steps': [
-                    {
-                        'id': step.id,
-                        'name': step.name,
-                        'status': step.status.value,
-                        'error': step.error
-                    }
-                    for step in workflow.steps
-                ]
-            }
+            return self._serialize_execution(execution_id, self.running_workflows[execution_id])
         
         # Check completed workflows in Redis
         workflow_data = await self.redis.get(f"workflow:{execution_id}")
@@ -475,6 +568,26 @@ class WorkflowEngine:
         
         return None
     
+    def _serialize_execution(self, execution_id: str, execution: Dict[str, Any]) -> Dict:
+        """Serialize a workflow execution for status queries"""
+        workflow = execution['workflow']
+        return {
+            'execution_id': execution_id,
+            'workflow_name': workflow.name,
+            'status': workflow.status.value,
+            'started_at': execution['started_at'].isoformat(),
+            'steps': [self._serialize_step(step) for step in workflow.steps]
+        }
+    
+    def _serialize_step(self, step: WorkflowStep) -> Dict:
+        """Serialize a workflow step for status queries"""
+        return {
+            'id': step.id,
+            'name': step.name,
+            'status': step.status.value,
+            'error': step.error
+        }
+    
     async def cancel_workflow(self, execution_id: str) -> bool:
         """Cancel running workflow"""
         if execution_id in self.running_workflows:
@@ -501,7 +614,7 @@ class CollaborationManager:
             repository=repository,
             participants={created_by},
             created_by=created_by,
-            created_at=datetime.utcnow()
+            created_at=_utcnow()
         )
         
         self.sessions[session.id] = session
@@ -589,7 +702,7 @@ class CollaborationManager:
             'type': 'state_update',
             'user_id': user_id,
             'update': update,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': _utcnow()
         })
     
     async def add_annotation(self, session_id: str, user_id: str, 
@@ -606,7 +719,7 @@ class CollaborationManager:
         annotation_data = {
             'id': str(uuid.uuid4()),
             'user_id': user_id,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': _utcnow(),
             **annotation
         }
         
@@ -632,15 +745,12 @@ class CollaborationManager:
             'id': str(uuid.uuid4()),
             'user_id': user_id,
             'message': message,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': _utcnow()
         }
         
+        # Bounded deque keeps only the most recent messages
         session.chat_history.append(chat_message)
         
-        # Keep only last 1000 messages
-        if len(session.chat_history) > 1000:
-            session.chat_history = session.chat_history[-1000:]
-        
         # Broadcast to all participants
         await self._broadcast_session_update(session_id, {
             'type': 'chat_message',
@@ -666,10 +776,11 @@ class CollaborationManager:
             return
         
         session = self.sessions[session_id]
-        message = json.dumps({
+        # orjson renders datetimes itself, so payloads carry them unformatted
+        message = orjson.dumps({
             'session_id': session_id,
             **update
-        })
+        }).decode()
         
         # Send to all participants with active WebSocket connections
         for user_id in session.participants:
@@ -707,6 +818,7 @@ class ReviewWorkflow:
         self.github = github_client
         self.ai = ai_analyzer
         self.review_rules = self._load_review_rules()
+        self._review_cache: OrderedDict = OrderedDict()
     
     def _load_review_rules(self) -> Dict[str, Any]:
         """Load code review rules"""
@@ -725,7 +837,12 @@ class ReviewWorkflow:
     
     async def automate_pr_review(self, repo_name: str, pr_number: int) -> Dict:
         """Automated PR review process"""
-        pr = self.github.get_repo(repo_name).get_pull(pr_number)
+        # PyGithub is blocking; fetch the PR and its paginated file list once,
+        # off the event loop, and share them with every check below
+        pr = await asyncio.to_thread(
+            lambda: self.github.get_repo(repo_name).get_pull(pr_number)
+        )
+        files = await asyncio.to_thread(lambda: list(pr.get_files()))
         
         review_result = {
             'pr_number': pr_number,
@@ -736,16 +853,15 @@ class ReviewWorkflow:
             'comments': []
         }
         
-        # Run automated checks
-        checks = await self._run_automated_checks(pr)
+        # Automated checks, AI analysis and reviewer suggestions are
+        # independent of each other
+        checks, ai_review, suggested_reviewers = await asyncio.gather(
+            self._run_automated_checks(pr, files),
+            self._ai_code_review(pr, files),
+            self._suggest_reviewers(pr, files)
+        )
         review_result['automated_checks'] = checks
-        
-        # AI analysis
-        ai_review = await self._ai_code_review(pr)
         review_result['ai_analysis'] = ai_review
-        
-        # Determine reviewers
-        suggested_reviewers = await self._suggest_reviewers(pr)
         review_result['suggested_reviewers'] = suggested_reviewers
         
         # Check auto-approval eligibility
@@ -758,7 +874,7 @@ class ReviewWorkflow:
         
         return review_result
     
-    async def _run_automated_checks(self, pr) -> List[Dict]:
+    async def _run_automated_checks(self, pr, files: List[Any]) -> List[Dict]:
         """Run automated PR checks"""
         checks = []
         
@@ -771,7 +887,6 @@ class ReviewWorkflow:
             })
         
         # Check for tests
-        files = list(pr.get_files())
         has_tests = any('test' in f.filename.lower() for f in files)
         
         if self.review_rules['require_tests'] and not has_tests:
@@ -793,29 +908,46 @@ class ReviewWorkflow:
         
         return checks
     
-    async def _ai_code_review(self, pr) -> Dict:
+    async def _ai_code_review(self, pr, files: List[Any]) -> Dict:
         """AI-powered code review"""
         # Get diff
         diff_content = []
-        for file in pr.get_files():
+        for file in files:
             if file.patch:
                 diff_content.append(f"File: {file.filename}\n{file.patch}")
         
+        diff = '\n'.join(diff_content)
+        
+        # Reruns over an unchanged diff reuse the previous review instead of
+        # another model round trip; the analyzer type is part of the key so
+        # swapping it invalidates old results
+        key = fast_hash(
+            f"{REVIEW_CACHE_VERSION}\0{type(self.ai).__qualname__}\0{diff}".encode()
+        )
+        cached = self._review_cache.get(key)
+        if cached is not None:
+            self._review_cache.move_to_end(key)
+            return cached
+        
         # Analyze with AI
-        analysis = await self.ai.analyze_code_diff('\n'.join(diff_content))
+        analysis = await self.ai.analyze_code_diff(diff)
         
-        return {
+        review = {
             'quality_score': analysis.get('quality_score', 0),
             'issues': analysis.get('issues', []),
             'suggestions': analysis.get('suggestions', [])
         }
+        self._review_cache[key] = review
+        if len(self._review_cache) > REVIEW_CACHE_SIZE:
+            self._review_cache.popitem(last=False)
+        return review
     
-    async def _suggest_reviewers(self, pr) -> List[str]:
+    async def _suggest_reviewers(self, pr, files: List[Any]) -> List[str]:
         """Suggest appropriate reviewers"""
         reviewers = set()
         
         # Check files for team assignments
-        for file in pr.get_files():
+        for file in files:
             for keyword, team in self.review_rules['mandatory_reviewers'].items():
                 if keyword in file.filename.lower():
                     reviewers.update(team)
@@ -843,7 +975,8 @@ class ReviewWorkflow:
     
     async def _approve_pr(self, pr):
         """Approve pull request"""
-        pr.create_review(
+        await asyncio.to_thread(
+            pr.create_review,
             body="Automated review passed all checks ✅",
             event="APPROVE"
         )
@@ -882,7 +1015,7 @@ class ReviewWorkflow:
             body += f"\n### Suggested Reviewers\n"
             body += f"Consider requesting review from: {', '.join(review_result['suggested_reviewers'])}\n"
         
-        pr.create_issue_comment(body)
+        await asyncio.to_thread(pr.create_issue_comment, body)
     
     def _matches_pattern(self, filename: str, pattern: str) -> bool:
         """Check if filename matches pattern"""
@@ -12,7 +12,7 @@ import aiohttp
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPServer:
     name: str
     host: str
@@ -222,14 +222,23 @@ class MCPClient:
     
     async def broadcast_operation(self, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Broadcast operation to all capable servers"""
-        results = {}
+        targets = [
+            server_name for server_name, server in self.servers.items()
+            if operation in server.capabilities
+        ]
+        
+        # Each server has its own connection, so the calls can overlap
+        responses = await asyncio.gather(
+            *(self.call_tool(server_name, operation, params) for server_name in targets),
+            return_exceptions=True
+        )
         
-        for server_name, server in self.servers.items():
-            if operation in server.capabilities:
-                try:
-                    results[server_name] = await self.call_tool(server_name, operation, params)
-                except Exception as e:
-                    results[server_name] = {'error': str(e)}
+        results = {}
+        for server_name, response in zip(targets, responses):
+            if isinstance(response, Exception):
+                results[server_name] = {'error': str(response)}
+            else:
+                results[server_name] = response
         
         return results
     
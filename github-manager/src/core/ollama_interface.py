@@ -3,18 +3,53 @@ Ollama Interface with Function Calling Capabilities
 """
 import asyncio
 import json
+import re
 import subprocess
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Set
 from pathlib import Path
 import logging
 import base64
+import io
+import time
+import aiofiles
 import aiohttp
+import git
+import orjson
 from dataclasses import dataclass
+from collections import OrderedDict
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from ..utils.hashing import fast_hash
+from ..utils.requirements import requirement_names
 
 logger = logging.getLogger(__name__)
 
+# Kept byte-identical across requests so Ollama can reuse the evaluated prefix
+TOOLS_SYSTEM_PROMPT = (
+    'You are a code analysis assistant with access to various tools. '
+    'Use them to analyze the repository and answer questions.'
+)
+
+# Generated responses are reused from disk for a day, keeping at most
+# RESPONSE_CACHE_MAX_FILES of them; the directory is pruned once every
+# RESPONSE_CACHE_PRUNE_EVERY writes rather than listed on each one
+RESPONSE_CACHE_TTL = 86400
+RESPONSE_CACHE_MAX_FILES = 1024
+RESPONSE_CACHE_PRUNE_EVERY = 64
+
+# Pattern syntax whose match at a line end differs between a whole-file
+# MULTILINE search and a search of the line alone
+PER_LINE_ONLY = re.compile(r'\\[AZz]|\(\?<?!')
+
+# Largest edge sent to the vision model; bigger images are downscaled first
+VISION_MAX_EDGE = 1024
 
-@dataclass
+
+@dataclass(slots=True)
 class Tool:
     name: str
     description: str
@@ -23,39 +58,55 @@ class Tool:
 
 
 class OllamaInterface:
-    def __init__(self, host: str = "http://localhost:11434"):
+    def __init__(self, host: str = "http://localhost:11434", cache_dir: Optional[Path] = None):
         self.host = host
+        self.cache_dir = cache_dir or Path('~/.cache/github-manager/ollama_responses').expanduser()
         self.session = None
         self.models = {
             'code': 'llama3.1:8b',
             'vision': 'llava:13b',
             'function_calling': 'llama3.1:8b'
         }
+        # Keeping models resident between calls lets Ollama reuse the
+        # evaluated prompt prefix instead of reloading and re-reading it
+        self.keep_alive = '30m'
         self.tools = {}
+        self._image_cache: OrderedDict = OrderedDict()
+        self._image_cache_size = 32
+        self._response_cache: OrderedDict = OrderedDict()
+        self._response_cache_size = 256
+        # The first write prunes whatever earlier runs left behind
+        self._writes_since_prune = RESPONSE_CACHE_PRUNE_EVERY
         self._setup_tools()
         
     async def initialize_models(self):
         """Pull required models if not available"""
         self.session = aiohttp.ClientSession()
         
+        # One /api/tags listing covers every configured model
+        available = await self.list_models()
         for model_type, model_name in self.models.items():
-            if not await self.model_exists(model_name):
+            if model_name not in available:
                 logger.info(f"Pulling {model_name}...")
                 await self.pull_model(model_name)
+                available.add(model_name)
             else:
                 logger.info(f"Model {model_name} already available")
     
-    async def model_exists(self, model_name: str) -> bool:
-        """Check if model exists"""
+    async def list_models(self) -> Set[str]:
+        """Names of the models installed on the Ollama server"""
         try:
             async with self.session.get(f"{self.host}/api/tags") as response:
                 if response.status == 200:
                     data = await response.json()
-                    models = [m['name'] for m in data.get('models', [])]
-                    return model_name in models
+                    return {m['name'] for m in data.get('models', [])}
         except Exception as e:
-            logger.error(f"Error checking model: {e}")
-        return False
+            logger.error(f"Error listing models: {e}")
+        return set()
+    
+    async def model_exists(self, model_name: str) -> bool:
+        """Check if model exists"""
+        return model_name in await self.list_models()
     
     async def pull_model(self, model_name: str):
         """Pull a model from Ollama"""
@@ -161,8 +212,17 @@ class OllamaInterface:
             )
         }
     
-    async def analyze_code_with_tools(self, repo_path: str, query: str) -> Dict:
-        """Analyze code using function calling capabilities"""
+    async def analyze_code_with_tools(
+        self,
+        repo_path: str,
+        query: str,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """Analyze code using function calling capabilities
+        
+        When on_token is given, the final answer is streamed to it as it is
+        generated instead of arriving only once the model has finished.
+        """
         
         # Convert tools to Ollama format
         tools_list = [
@@ -180,7 +240,7 @@ class OllamaInterface:
         messages = [
             {
                 'role': 'system',
-                'content': 'You are a code analysis assistant with access to various tools. Use them to analyze the repository and answer questions.'
+                'content': TOOLS_SYSTEM_PROMPT
             },
             {
                 'role': 'user',
@@ -195,7 +255,8 @@ class OllamaInterface:
                 'model': self.models['function_calling'],
                 'messages': messages,
                 'tools': tools_list,
-                'stream': False
+                'stream': False,
+                'keep_alive': self.keep_alive
             }
         ) as response:
             result = await response.json()
@@ -206,7 +267,11 @@ class OllamaInterface:
             
             for tool_call in result['message']['tool_calls']:
                 function_name = tool_call['function']['name']
-                arguments = json.loads(tool_call['function']['arguments'])
+                # Ollama already decodes arguments into an object; only
+                # OpenAI-style string payloads still need parsing
+                arguments = tool_call['function']['arguments']
+                if isinstance(arguments, (str, bytes)):
+                    arguments = orjson.loads(arguments)
                 
                 # Execute tool function
                 tool_result = await self.execute_tool_function(function_name, arguments)
@@ -221,66 +286,69 @@ class OllamaInterface:
             messages.extend(tool_results)
             
             # Get final response
-            async with self.session.post(
-                f"{self.host}/api/chat",
-                json={
-                    'model': self.models['function_calling'],
-                    'messages': messages,
-                    'stream': False
-                }
-            ) as response:
-                final_result = await response.json()
+            payload = {
+                'model': self.models['function_calling'],
+                'messages': messages,
+                'stream': on_token is not None,
+                'keep_alive': self.keep_alive
+            }
+            if on_token is not None:
+                analysis = await self._stream_chat(payload, on_token)
+            else:
+                async with self.session.post(f"{self.host}/api/chat", json=payload) as response:
+                    final_result = await response.json()
+                analysis = final_result['message']['content']
             
             return {
-                'analysis': final_result['message']['content'],
+                'analysis': analysis,
                 'tool_calls_made': len(tool_results),
                 'tools_used': [tc['function']['name'] for tc in result['message']['tool_calls']]
             }
         
+        if on_token is not None:
+            on_token(result['message']['content'])
         return {
             'analysis': result['message']['content'],
             'tool_calls_made': 0,
             'tools_used': []
         }
     
+    async def _stream_chat(self, payload: Dict[str, Any], on_token: Callable[[str], None]) -> str:
+        """POST a streaming /api/chat request, forwarding each chunk as it arrives"""
+        parts = []
+        async with self.session.post(f"{self.host}/api/chat", json=payload) as response:
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                chunk = orjson.loads(line)
+                token = chunk.get('message', {}).get('content', '')
+                if token:
+                    parts.append(token)
+                    on_token(token)
+                if chunk.get('done'):
+                    break
+        return ''.join(parts)
+    
     async def analyze_with_vision(self, repo_path: str, prompt: str, repo_data: Dict) -> Dict:
         """Analyze repository using vision model for diagrams/screenshots"""
-        # Find images in repository
-        image_files = []
+        # Find images in repository; the walk runs in a worker thread so a
+        # large checkout doesn't stall the event loop
         path = Path(repo_path)
-        
-        for ext in ['.png', '.jpg', '.jpeg', '.svg']:
-            image_files.extend(path.rglob(f'*{ext}'))
+        image_files = await asyncio.to_thread(self._find_images, path)
+        # Repositories often carry byte-identical copies of the same logo or
+        # diagram; only distinct images are worth a vision request
+        image_files = await asyncio.to_thread(self._distinct_images, image_files, 3)  # Limit to 3 images
         
         if not image_files:
             return await self.analyze_code(repo_path, prompt, repo_data)
         
-        # Analyze first few images
-        analyses = []
-        for img_file in image_files[:3]:  # Limit to 3 images
-            try:
-                with open(img_file, 'rb') as f:
-                    image_data = base64.b64encode(f.read()).decode()
-                
-                async with self.session.post(
-                    f"{self.host}/api/generate",
-                    json={
-                        'model': self.models['vision'],
-                        'prompt': f"Analyze this image from the repository: {prompt}",
-                        'images': [image_data],
-                        'stream': False
-                    }
-                ) as response:
-                    result = await response.json()
-                    analyses.append({
-                        'file': str(img_file.relative_to(path)),
-                        'analysis': result['response']
-                    })
-            except Exception as e:
-                logger.error(f"Error analyzing image {img_file}: {e}")
-        
-        # Combine with code analysis
-        code_analysis = await self.analyze_code(repo_path, prompt, repo_data)
+        # The code analysis and the per-image analyses are independent
+        # requests, so they are issued together rather than one after another
+        code_analysis, *analyses = await asyncio.gather(
+            self.analyze_code(repo_path, prompt, repo_data),
+            *(self._analyze_image(img_file, path, prompt) for img_file in image_files)
+        )
+        analyses = [a for a in analyses if a is not None]
         
         return {
             'code_analysis': code_analysis,
@@ -288,6 +356,158 @@ class OllamaInterface:
             'has_visuals': True
         }
     
+    async def _analyze_image(self, img_file: Path, root: Path, prompt: str) -> Optional[Dict]:
+        """Run the vision model over one image, or None if that fails"""
+        try:
+            image_data = await self._encode_image(img_file)
+            result = await self._generate({
+                'model': self.models['vision'],
+                'prompt': f"Analyze this image from the repository: {prompt}",
+                'images': [image_data],
+                'stream': False
+            })
+            return {
+                'file': str(img_file.relative_to(root)),
+                'analysis': result['response']
+            }
+        except Exception as e:
+            logger.error(f"Error analyzing image {img_file}: {e}")
+            return None
+    
+    @staticmethod
+    def _find_images(path: Path) -> List[Path]:
+        image_files = []
+        # SVG is left out: it is markup, not pixels, and the vision model can't read it
+        for ext in ['.png', '.jpg', '.jpeg']:
+            image_files.extend(path.rglob(f'*{ext}'))
+        return image_files
+    
+    @staticmethod
+    def _distinct_images(image_files: List[Path], limit: int) -> List[Path]:
+        seen = set()
+        distinct = []
+        for img_file in image_files:
+            try:
+                digest = fast_hash(img_file.read_bytes())
+            except OSError:
+                continue
+            if digest not in seen:
+                seen.add(digest)
+                distinct.append(img_file)
+                if len(distinct) == limit:
+                    break
+        return distinct
+    
+    async def _encode_image(self, img_file: Path) -> str:
+        """Base64-encode an image, reusing the payload while the file is unchanged"""
+        stat = img_file.stat()
+        key = (str(img_file), stat.st_mtime_ns, stat.st_size)
+        
+        image_data = self._image_cache.get(key)
+        if image_data is not None:
+            self._image_cache.move_to_end(key)
+            return image_data
+        
+        # Reading and encoding a multi-megabyte image is blocking work, so it
+        # runs off the loop; the cache itself is only touched from the loop
+        image_data = await asyncio.to_thread(self._read_base64, img_file)
+        
+        self._image_cache[key] = image_data
+        if len(self._image_cache) > self._image_cache_size:
+            self._image_cache.popitem(last=False)
+        return image_data
+    
+    @staticmethod
+    def _read_base64(img_file: Path) -> str:
+        if Image is not None:
+            # Screenshots and diagrams are often far larger than the model's
+            # input resolution; shrinking and re-encoding as JPEG cuts the
+            # upload by an order of magnitude
+            try:
+                with Image.open(img_file) as img:
+                    if max(img.size) > VISION_MAX_EDGE:
+                        img.thumbnail((VISION_MAX_EDGE, VISION_MAX_EDGE))
+                        buf = io.BytesIO()
+                        img.convert('RGB').save(buf, format='JPEG', quality=80)
+                        return base64.b64encode(buf.getvalue()).decode()
+            except OSError:
+                pass
+        with open(img_file, 'rb') as f:
+            return base64.b64encode(f.read()).decode()
+    
+    async def _generate(self, payload: Dict[str, Any], cache: bool = True) -> Dict:
+        """POST to /api/generate, answering repeated identical requests from memory or disk
+        
+        With cache=False the request always reaches the model and nothing is stored.
+        """
+        payload.setdefault('keep_alive', self.keep_alive)
+        if not cache:
+            async with self.session.post(f"{self.host}/api/generate", json=payload) as response:
+                return await response.json()
+        
+        key = fast_hash(json.dumps(payload, sort_keys=True).encode())
+        result = self._response_cache.get(key)
+        if result is not None:
+            self._response_cache.move_to_end(key)
+            return result
+        
+        cache_file = self.cache_dir / f"{key}.json"
+        result = await self._load_cached_response(cache_file)
+        if result is None:
+            async with self.session.post(f"{self.host}/api/generate", json=payload) as response:
+                result = await response.json()
+            if 'response' not in result:
+                return result
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                async with aiofiles.open(cache_file, 'w') as f:
+                    await f.write(json.dumps({'created': time.time(), 'result': result}))
+                self._writes_since_prune += 1
+            except OSError as e:
+                logger.warning(f"Failed to cache model response: {e}")
+            
+            if self._writes_since_prune >= RESPONSE_CACHE_PRUNE_EVERY:
+                self._writes_since_prune = 0
+                try:
+                    await asyncio.to_thread(self._prune_response_cache, cache_file.parent)
+                except OSError as e:
+                    logger.warning(f"Failed to prune the model response cache: {e}")
+        
+        self._response_cache[key] = result
+        if len(self._response_cache) > self._response_cache_size:
+            self._response_cache.popitem(last=False)
+        return result
+    
+    @staticmethod
+    async def _load_cached_response(cache_file: Path) -> Optional[Dict]:
+        try:
+            async with aiofiles.open(cache_file, 'r') as f:
+                entry = json.loads(await f.read())
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('created', 0) > RESPONSE_CACHE_TTL:
+            try:
+                cache_file.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return None
+        return entry.get('result')
+    
+    @staticmethod
+    def _prune_response_cache(cache_dir: Path):
+        """Delete expired responses, then the oldest beyond RESPONSE_CACHE_MAX_FILES"""
+        entries = []
+        for cache_file in cache_dir.glob('*.json'):
+            try:
+                entries.append((cache_file.stat().st_mtime, cache_file))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        cutoff = time.time() - RESPONSE_CACHE_TTL
+        for i, (mtime, cache_file) in enumerate(entries):
+            if i >= RESPONSE_CACHE_MAX_FILES or mtime < cutoff:
+                cache_file.unlink(missing_ok=True)
+    
     async def analyze_code(self, repo_path: str, prompt: str, repo_data: Dict) -> Dict:
         """Analyze code without vision capabilities"""
         context = f"""
@@ -301,15 +521,11 @@ class OllamaInterface:
         {prompt}
         """
         
-        async with self.session.post(
-            f"{self.host}/api/generate",
-            json={
-                'model': self.models['code'],
-                'prompt': context,
-                'stream': False
-            }
-        ) as response:
-            result = await response.json()
+        result = await self._generate({
+            'model': self.models['code'],
+            'prompt': context,
+            'stream': False
+        })
         
         return {
             'analysis': result['response'],
@@ -323,16 +539,22 @@ class OllamaInterface:
     
     async def analyze_text(self, prompt: str) -> str:
         """Simple text analysis"""
-        async with self.session.post(
-            f"{self.host}/api/generate",
-            json={
-                'model': self.models['code'],
-                'prompt': prompt,
-                'stream': False
-            }
-        ) as response:
-            result = await response.json()
-            return result['response']
+        result = await self._generate({
+            'model': self.models['code'],
+            'prompt': prompt,
+            'stream': False
+        })
+        return result['response']
+    
+    async def analyze_json(self, prompt: str) -> Any:
+        """Text analysis constrained to a JSON response, returned parsed"""
+        result = await self._generate({
+            'model': self.models['code'],
+            'prompt': prompt,
+            'format': 'json',
+            'stream': False
+        })
+        return json.loads(result['response'])
     
     async def execute_tool_function(self, function_name: str, arguments: Dict) -> Any:
         """Execute tool functions"""
@@ -378,7 +600,6 @@ class OllamaInterface:
     async def _git_status(self, repo_path: str) -> Dict:
         """Get git status"""
         try:
-            import git
             repo = git.Repo(repo_path)
             return {
                 'branch': repo.active_branch.name,
@@ -393,7 +614,15 @@ class OllamaInterface:
     async def _search_code(self, pattern: str, path: str, file_pattern: str = '*') -> Dict:
         """Search for code patterns"""
         try:
-            import re
+            regex = re.compile(pattern)
+            # One pass over the whole file rules out the (usual) files with
+            # no match before paying for the per-line scan. Anchors and
+            # negative lookarounds behave differently at a line end inside
+            # the file than at the end of a line string, so patterns using
+            # them skip the prefilter
+            file_regex = None
+            if not PER_LINE_ONLY.search(pattern):
+                file_regex = re.compile(pattern, re.MULTILINE)
             matches = []
             path_obj = Path(path)
             
@@ -402,8 +631,10 @@ class OllamaInterface:
                     try:
                         with open(file_path, 'r') as f:
                             content = f.read()
+                            if file_regex is not None and not file_regex.search(content):
+                                continue
                             for i, line in enumerate(content.splitlines(), 1):
-                                if re.search(pattern, line):
+                                if regex.search(line):
                                     matches.append({
                                         'file': str(file_path.relative_to(path_obj)),
                                         'line': i,
@@ -433,7 +664,7 @@ class OllamaInterface:
             
             if (path / 'requirements.txt').exists():
                 with open(path / 'requirements.txt') as f:
-                    deps['pip'] = [line.strip().split('==')[0] for line in f if line.strip()]
+                    deps['pip'] = requirement_names(f)
             
             if (path / 'Cargo.toml').exists():
                 deps['cargo'] = {'found': True}  # Simplified
@@ -446,16 +677,13 @@ class OllamaInterface:
         """Generate code based on prompt"""
         code_prompt = f"Generate {language} code for: {prompt}\n\nProvide only the code without explanations."
         
-        async with self.session.post(
-            f"{self.host}/api/generate",
-            json={
-                'model': self.models['code'],
-                'prompt': code_prompt,
-                'stream': False
-            }
-        ) as response:
-            result = await response.json()
-            return result['response']
+        # Generated code is sampled fresh on every request, never replayed
+        result = await self._generate({
+            'model': self.models['code'],
+            'prompt': code_prompt,
+            'stream': False
+        }, cache=False)
+        return result['response']
     
     async def cleanup(self):
         """Cleanup resources"""
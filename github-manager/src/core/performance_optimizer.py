@@ -8,20 +8,20 @@ from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from functools import lru_cache, wraps
 from typing import Dict, List, Any, Optional, Callable, AsyncIterator
 from pathlib import Path
-import hashlib
 import pickle
 import time
 import psutil
 import resource
 from dataclasses import dataclass
 import numpy as np
-from collections import defaultdict, OrderedDict
-import heapq
+from collections import defaultdict, OrderedDict, deque
 import logging
 import msgpack
 import uvloop
 from asyncio import Queue, Semaphore
 
+from ..utils.hashing import fast_hash
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,30 +47,84 @@ class PerformanceMetrics:
         return self.memory_after - self.memory_before
 
 
+# Lookup table that halves every byte, used to age sketch counters
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+class FrequencySketch:
+    """Count-Min sketch of recent access frequencies for TinyLFU admission"""
+    
+    # Odd 64-bit multipliers; each row takes the top bits of hash * seed
+    _SEEDS = (0x9E3779B97F4A7C15, 0xBF58476D1CE4E5B9, 0x94D049BB133111EB, 0xD6E8FEB86659FD93)
+    _MASK64 = (1 << 64) - 1
+    _MAX_COUNT = 15  # 4-bit saturating counters
+    
+    def __init__(self, capacity: int):
+        bits = max(4, (4 * capacity - 1).bit_length())
+        width = 1 << bits
+        self._shift = 64 - bits
+        self._rows = [bytearray(width) for _ in self._SEEDS]
+        self._sample_size = 10 * capacity
+        self._additions = 0
+    
+    def _indexes(self, key: str):
+        h = hash(key) & self._MASK64
+        mask, shift = self._MASK64, self._shift
+        return [((h * seed) & mask) >> shift for seed in self._SEEDS]
+    
+    def increment(self, key: str):
+        """Record an access to key"""
+        for row, i in zip(self._rows, self._indexes(key)):
+            if row[i] < self._MAX_COUNT:
+                row[i] += 1
+        
+        # Periodically halve every counter so old popularity fades
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._rows = [bytearray(row.translate(_HALVE)) for row in self._rows]
+            self._additions //= 2
+    
+    def estimate(self, key: str) -> int:
+        """Estimated recent access count for key"""
+        return min(row[i] for row, i in zip(self._rows, self._indexes(key)))
+
+
 class AdaptiveCache:
-    """Intelligent caching system with LRU + LFU hybrid approach"""
+    """Intelligent caching system with LRU + LFU hybrid approach
+    
+    Per-entry metadata lives in preallocated parallel arrays indexed by slot
+    instead of per-key dicts, so expiry sweeps are vectorized.
+    """
     
     def __init__(self, max_size: int = 1000, ttl: int = 3600):
         self.max_size = max_size
         self.ttl = ttl
-        self.cache = OrderedDict()
-        self.frequency = defaultdict(int)
-        self.timestamps = {}
-        self.stats = {'hits': 0, 'misses': 0}
+        self.cache = {}
+        self.referenced = set()  # CLOCK reference bits
+        self._hand = 0  # slot the next CLOCK sweep starts from
+        self.sketch = FrequencySketch(max_size)
+        self.stats = {'hits': 0, 'misses': 0, 'rejected': 0}
+        
+        # Slot-indexed metadata
+        self._index: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = [None] * max_size
+        self._expires = np.zeros(max_size, dtype=np.float64)
+        self._free = list(range(max_size - 1, -1, -1))
         
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        if key in self.cache:
+        self.sketch.increment(key)
+        slot = self._index.get(key)
+        if slot is not None:
             # Check TTL
-            if time.time() - self.timestamps[key] > self.ttl:
-                del self.cache[key]
-                del self.timestamps[key]
+            if self._expires[slot] < time.monotonic():
+                self._remove(key)
                 self.stats['misses'] += 1
                 return None
             
-            # Update access pattern
-            self.frequency[key] += 1
-            self.cache.move_to_end(key)
+            # Update access pattern; setting the reference bit replaces
+            # reordering the entry on every hit
+            self.referenced.add(key)
             self.stats['hits'] += 1
             return self.cache[key]
         
@@ -79,37 +133,75 @@ class AdaptiveCache:
     
     def set(self, key: str, value: Any):
         """Set value in cache"""
-        if key in self.cache:
+        self.sketch.increment(key)
+        slot = self._index.get(key)
+        if slot is not None:
             del self.cache[key]
-        elif len(self.cache) >= self.max_size:
-            # Evict based on combined LRU/LFU score
-            self._evict()
+        else:
+            if len(self.cache) >= self.max_size:
+                # TinyLFU admission: a newcomer that has been requested less
+                # often than the CLOCK victim would only pollute the cache;
+                # otherwise that same victim makes room for it
+                victim = self._clock_victim()
+                if self.sketch.estimate(key) < self.sketch.estimate(victim):
+                    self.stats['rejected'] += 1
+                    return
+                self._remove(victim)
+            
+            slot = self._free.pop()
+            self._index[key] = slot
+            self._keys[slot] = key
         
         self.cache[key] = value
-        self.timestamps[key] = time.time()
-        self.frequency[key] = 1
-    
-    def _evict(self):
-        """Evict items based on adaptive algorithm"""
-        # Calculate scores (lower is better)
-        scores = []
-        current_time = time.time()
-        
-        for key in self.cache:
-            age = current_time - self.timestamps[key]
-            freq = self.frequency[key]
-            # Combined score: age/frequency
-            score = age / (freq + 1)
-            heapq.heappush(scores, (-score, key))
-        
-        # Evict bottom 10%
-        evict_count = max(1, int(self.max_size * 0.1))
-        for _ in range(evict_count):
-            if scores:
-                _, key = heapq.heappop(scores)
-                del self.cache[key]
-                del self.timestamps[key]
-                del self.frequency[key]
+        self._expires[slot] = time.monotonic() + self.ttl
+    
+    def clear(self):
+        """Drop every entry"""
+        self.cache.clear()
+        self.referenced.clear()
+        self._index.clear()
+        self._keys = [None] * self.max_size
+        self._free = list(range(self.max_size - 1, -1, -1))
+        self._hand = 0
+    
+    def purge_expired(self) -> int:
+        """Remove all expired entries in one sweep, returning how many"""
+        slots = self._occupied_slots()
+        expired = slots[self._expires[slots] < time.monotonic()]
+        keys = self._keys
+        for slot in expired.tolist():
+            self._remove(keys[slot])
+        return len(expired)
+    
+    def _occupied_slots(self) -> np.ndarray:
+        return np.fromiter(self._index.values(), dtype=np.intp, count=len(self._index))
+    
+    def _remove(self, key: str):
+        slot = self._index.pop(key)
+        del self.cache[key]
+        self._keys[slot] = None
+        self.referenced.discard(key)
+        self._free.append(slot)
+    
+    def _clock_victim(self) -> str:
+        """Second-chance sweep over the slots, clearing reference bits
+        
+        The hand resumes where the previous sweep stopped, so each entry's
+        bit is cleared at most once per revolution. Only called on a full
+        cache; the sweep ends within two revolutions.
+        """
+        keys, referenced = self._keys, self.referenced
+        hand, size = self._hand, self.max_size
+        while True:
+            key = keys[hand]
+            hand = (hand + 1) % size
+            if key is None:
+                continue
+            if key in referenced:
+                referenced.discard(key)
+                continue
+            self._hand = hand
+            return key
     
     @property
     def hit_rate(self) -> float:
@@ -179,12 +271,37 @@ class ParallelExecutor:
         loop = asyncio.get_event_loop()
         
         # Create tasks with semaphore
-        tasks = []
-        for item in items:
-            task = self._execute_with_limit(loop, executor, func, item)
-            tasks.append(task)
-        
-        return await asyncio.gather(*tasks)
+        tasks = [
+            asyncio.ensure_future(self._execute_with_limit(loop, executor, func, item))
+            for item in items
+        ]
+        if not tasks:
+            return []
+        
+        # Stop at the first failure rather than letting the remaining work
+        # run to completion for a result that will be discarded
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        except asyncio.CancelledError:
+            # The caller was cancelled; the work must not outlive it
+            for task in tasks:
+                task.cancel()
+            raise
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        # Every failure is retrieved, so none is later logged as "never
+        # retrieved"; the first in input order is raised
+        errors = [
+            task.exception() for task in tasks
+            if not task.cancelled() and task.exception() is not None
+        ]
+        if errors:
+            raise errors[0]
+        
+        return [task.result() for task in tasks]
     
     async def _execute_with_limit(self, loop, executor, func, item):
         """Execute with concurrency limit"""
@@ -213,22 +330,31 @@ class ConnectionPool:
         self.timeout = aiohttp.ClientTimeout(total=timeout)
         self.connector = None
         self.session = None
+        self._init_lock = asyncio.Lock()
         
     async def initialize(self):
-        """Initialize connection pool"""
-        self.connector = aiohttp.TCPConnector(
-            limit=self.pool_size,
-            ttl_dns_cache=300,
-            enable_cleanup_closed=True
-        )
-        self.session = aiohttp.ClientSession(
-            connector=self.connector,
-            timeout=self.timeout
-        )
+        """Initialize connection pool; safe to call more than once"""
+        if self.session is not None:
+            return
+        
+        async with self._init_lock:
+            # Another caller may have finished initializing while we waited
+            if self.session is not None:
+                return
+            
+            self.connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=self.connector,
+                timeout=self.timeout
+            )
     
     async def request(self, method: str, url: str, **kwargs) -> aiohttp.ClientResponse:
         """Make HTTP request using pool"""
-        if not self.session:
+        if self.session is None:
             await self.initialize()
         
         return await self.session.request(method, url, **kwargs)
@@ -239,6 +365,17 @@ class ConnectionPool:
             await self.session.close()
 
 
+def _propagate_failure(future: asyncio.Future, exc: BaseException):
+    """Hand a failed load or query to callers waiting on the same key"""
+    if isinstance(exc, asyncio.CancelledError):
+        future.cancel()
+    else:
+        future.set_exception(exc)
+        # Mark the exception retrieved so a future nobody joined doesn't
+        # log "exception was never retrieved"
+        future.exception()
+
+
 class QueryOptimizer:
     """Optimize database and API queries"""
     
@@ -247,6 +384,7 @@ class QueryOptimizer:
         self.batch_queue = defaultdict(list)
         self.batch_size = 100
         self.batch_timeout = 0.1  # 100ms
+        self.inflight: Dict[str, asyncio.Future] = {}
         
     async def execute_query(self, query: str, params: Dict = None) -> Any:
         """Execute query with caching"""
@@ -258,11 +396,28 @@ class QueryOptimizer:
         if cached is not None:
             return cached
         
-        # Execute query
-        result = await self._execute_raw_query(query, params)
+        # Join an identical query that is already running instead of
+        # issuing a duplicate (shielded so one caller's cancellation
+        # doesn't cancel it for the others)
+        pending = self.inflight.get(cache_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[cache_key] = future
+        
+        try:
+            # Execute query
+            result = await self._execute_raw_query(query, params)
+        except BaseException as e:
+            _propagate_failure(future, e)
+            raise
+        finally:
+            del self.inflight[cache_key]
         
         # Cache result
         self.query_cache.set(cache_key, result)
+        future.set_result(result)
         
         return result
     
@@ -308,7 +463,7 @@ class QueryOptimizer:
     def _generate_cache_key(self, query: str, params: Dict) -> str:
         """Generate cache key for query"""
         key_data = f"{query}:{sorted(params.items()) if params else ''}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        return fast_hash(key_data.encode())
     
     async def _execute_raw_query(self, query: str, params: Dict) -> Any:
         """Execute actual query (to be implemented)"""
@@ -390,25 +545,28 @@ class LazyLoader:
         
         # Check if already loading
         if key in self.loading:
-            return await self.loading[key]
+            return await asyncio.shield(self.loading[key])
         
         # Load item
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
         self.loading[key] = future
         
         try:
             value = await self.loader_func(key)
-            
-            # Add to cache
-            if len(self.cache) >= self.cache_size:
-                self.cache.popitem(last=False)
-            self.cache[key] = value
-            
-            future.set_result(value)
-            return value
-            
+        except BaseException as e:
+            # Waiters would otherwise hang on a future that never resolves
+            _propagate_failure(future, e)
+            raise
         finally:
             del self.loading[key]
+        
+        # Add to cache
+        if len(self.cache) >= self.cache_size:
+            self.cache.popitem(last=False)
+        self.cache[key] = value
+        
+        future.set_result(value)
+        return value
 
 
 def performance_monitor(func):
@@ -416,7 +574,7 @@ def performance_monitor(func):
     @wraps(func)
     async def wrapper(*args, **kwargs):
         # Start metrics
-        start_time = time.time()
+        start_time = time.perf_counter()
         process = psutil.Process()
         memory_before = process.memory_info().rss
         cpu_before = process.cpu_percent()
@@ -425,7 +583,7 @@ def performance_monitor(func):
         result = await func(*args, **kwargs)
         
         # End metrics
-        end_time = time.time()
+        end_time = time.perf_counter()
         memory_after = process.memory_info().rss
         cpu_after = process.cpu_percent()
         
@@ -461,7 +619,7 @@ class PerformanceOptimizer:
         self.query_optimizer = QueryOptimizer()
         self.memory_manager = MemoryManager()
         self.lazy_loader = LazyLoader(self._default_loader)
-        self.metrics = []
+        self.metrics = deque(maxlen=100)
         
     async def initialize(self):
         """Initialize all components"""
@@ -477,46 +635,43 @@ class PerformanceOptimizer:
     async def optimize_file_processing(self, file_paths: List[Path], 
                                      processor: Callable) -> List[Any]:
         """Optimize processing of multiple files"""
-        # Check cache first
+        # Check cache first, splitting misses by size in the same pass so
+        # each path is stat()ed once
         results = []
-        uncached_paths = []
+        small_files = []
+        large_files = []
         
         for path in file_paths:
-            cache_key = f"file:{path}:{path.stat().st_mtime}"
+            stat = path.stat()
+            cache_key = f"file:{path}:{stat.st_mtime}"
             cached = self.cache.get(cache_key)
             
             if cached:
                 results.append(cached)
+            elif stat.st_size > 10 * 1024 * 1024:
+                large_files.append((path, cache_key))
             else:
-                uncached_paths.append(path)
+                small_files.append((path, cache_key))
         
-        # Process uncached files in parallel
-        if uncached_paths:
-            # Use streaming for large files
-            large_files = [p for p in uncached_paths if p.stat().st_size > 10 * 1024 * 1024]
-            small_files = [p for p in uncached_paths if p not in large_files]
-            
-            # Process small files in parallel
-            if small_files:
-                small_results = await self.parallel_executor.map_async(
-                    processor, small_files
-                )
-                results.extend(small_results)
-                
-                # Cache results
-                for path, result in zip(small_files, small_results):
-                    cache_key = f"file:{path}:{path.stat().st_mtime}"
-                    self.cache.set(cache_key, result)
+        # Process small files in parallel
+        if small_files:
+            small_results = await self.parallel_executor.map_async(
+                processor, [path for path, _ in small_files]
+            )
+            results.extend(small_results)
             
-            # Stream process large files
-            for path in large_files:
-                result = await self._process_large_file(path, processor)
-                results.append(result)
-                
-                # Cache result
-                cache_key = f"file:{path}:{path.stat().st_mtime}"
+            # Cache results
+            for (_, cache_key), result in zip(small_files, small_results):
                 self.cache.set(cache_key, result)
         
+        # Stream process large files
+        for path, cache_key in large_files:
+            result = await self._process_large_file(path, processor)
+            results.append(result)
+            
+            # Cache result
+            self.cache.set(cache_key, result)
+        
         return results
     
     async def _process_large_file(self, path: Path, processor: Callable) -> Any:
@@ -546,7 +701,7 @@ class PerformanceOptimizer:
         logger.warning(f"High memory usage detected: {memory_info}")
         
         # Clear caches
-        self.cache.cache.clear()
+        self.cache.clear()
         
         # Trigger garbage collection
         import gc
@@ -562,7 +717,7 @@ class PerformanceOptimizer:
             'cache_size': len(self.cache.cache),
             'memory_usage': self.memory_manager.check_memory(),
             'parallel_workers': self.parallel_executor.max_workers,
-            'metrics': self.metrics[-100:]  # Last 100 metrics
+            'metrics': list(self.metrics)  # Last 100 metrics
         }
     
     async def cleanup(self):
@@ -3,6 +3,7 @@ GitHub Repository Manager with AI Integration
 """
 import asyncio
 import json
+import os
 import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -10,7 +11,7 @@ import git
 from github import Github
 import aiofiles
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 
 from .mcp_client import MCPClient
 from .ollama_interface import OllamaInterface
@@ -18,21 +19,32 @@ from ..utils.config import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+VISUAL_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp'})
+PRIORITY_LABELS = frozenset({'critical', 'high-priority', 'bug'})
+
 
 class GitHubRepoManager:
     def __init__(self, config_path: str = "config/github_config.yaml"):
         self.config = ConfigManager(config_path)
-        self.github = Github(self.config.get('github_token'))
+        # 100 is the API maximum; full listings take a third of the requests
+        self.github = Github(self.config.get('github_token'), per_page=100)
         self.mcp_client = MCPClient()
         self.ollama = OllamaInterface()
         self.local_repos_path = Path(self.config.get('local_repos_path', '~/Development')).expanduser()
         self.repo_cache = {}
+        # The last scan's results; repo_cache keeps only one repository per
+        # directory name
+        self.local_repos: List[Dict] = []
         
     async def initialize(self):
         """Initialize all components"""
-        await self.mcp_client.connect_servers(self.config.get('mcp_servers', []))
-        await self.ollama.initialize_models()
-        self.scan_local_repositories()
+        # The three start-up steps are independent: two wait on other
+        # processes and the repository scan runs in a worker thread
+        _, _, self.local_repos = await asyncio.gather(
+            self.mcp_client.connect_servers(self.config.get('mcp_servers', [])),
+            self.ollama.initialize_models(),
+            asyncio.to_thread(self.scan_local_repositories)
+        )
         logger.info("GitHub Repository Manager initialized")
         
     def scan_local_repositories(self) -> List[Dict]:
@@ -128,24 +140,9 @@ class GitHubRepoManager:
         
         path = Path(repo_path)
         
-        # File analysis
-        for file_path in path.rglob('*'):
-            if file_path.is_file() and not any(part.startswith('.') for part in file_path.parts):
-                rel_path = file_path.relative_to(path)
-                ext = file_path.suffix
-                
-                data['files'].append(str(rel_path))
-                
-                if ext:
-                    data['languages'][ext] = data['languages'].get(ext, 0) + 1
-                
-                # Identify tests
-                if any(pattern in str(rel_path).lower() for pattern in ['test', 'spec']):
-                    data['tests'].append(str(rel_path))
-                
-                # Identify docs
-                if ext in ['.md', '.rst', '.txt'] or 'doc' in str(rel_path).lower():
-                    data['docs'].append(str(rel_path))
+        # File analysis: one scandir walk in a worker thread; hidden
+        # directories are pruned instead of walked and filtered afterwards
+        await asyncio.to_thread(self._scan_files, path, data)
         
         # Dependency files
         dep_files = {
@@ -163,15 +160,55 @@ class GitHubRepoManager:
         
         return data
     
+    @staticmethod
+    def _scan_files(root: Path, data: Dict[str, Any]):
+        """Walk the repository once, filling in files, languages, tests and docs"""
+        files, languages = data['files'], data['languages']
+        tests, docs = data['tests'], data['docs']
+        stack = [(str(root), '')]
+        
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if name.startswith('.'):
+                            continue
+                        rel_path = os.path.join(rel_dir, name) if rel_dir else name
+                        
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, rel_path))
+                            continue
+                        if not entry.is_file():
+                            continue
+                        
+                        ext = os.path.splitext(name)[1]
+                        lowered = rel_path.lower()
+                        files.append(rel_path)
+                        
+                        if ext:
+                            languages[ext] = languages.get(ext, 0) + 1
+                        
+                        # Identify tests
+                        if 'test' in lowered or 'spec' in lowered:
+                            tests.append(rel_path)
+                        
+                        # Identify docs
+                        if ext in ('.md', '.rst', '.txt') or 'doc' in lowered:
+                            docs.append(rel_path)
+            except OSError as e:
+                logger.warning(f"Failed to scan {dir_path}: {e}")
+    
     def has_visual_content(self, repo_path: str) -> bool:
         """Check if repository contains visual content"""
-        visual_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp'}
         path = Path(repo_path)
         
-        for ext in visual_extensions:
-            if list(path.rglob(f'*{ext}')):
-                return True
-        return False
+        # Single walk that stops at the first image instead of one full
+        # rglob (materialized into a list) per extension
+        return any(
+            p.suffix.lower() in VISUAL_EXTENSIONS for p in path.rglob('*')
+        )
     
     async def create_repository(self, name: str, description: str = "", private: bool = False) -> Dict:
         """Create a new GitHub repository"""
@@ -204,25 +241,31 @@ class GitHubRepoManager:
             if not repo_info:
                 return {'success': False, 'error': 'Repository not found'}
             
-            repo = git.Repo(repo_info['path'])
-            origin = repo.remote('origin')
-            
-            # Fetch latest changes
-            origin.fetch()
-            
-            # Pull if no local changes
-            if not repo.is_dirty():
-                origin.pull()
-                return {'success': True, 'action': 'pulled'}
-            else:
-                return {
-                    'success': False, 
-                    'error': 'Local changes present',
-                    'modified_files': [item.a_path for item in repo.index.diff(None)]
-                }
+            # Fetching and merging block on git, so they run in a worker thread
+            return await asyncio.to_thread(self._sync_checkout, repo_info['path'])
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    @staticmethod
+    def _sync_checkout(path: str) -> Dict:
+        repo = git.Repo(path)
+        origin = repo.remote('origin')
+        
+        # Fetch latest changes
+        origin.fetch()
+        
+        # Fast-forward to the fetched upstream if no local changes; pull()
+        # would fetch a second time and fall back to a merge commit
+        if not repo.is_dirty():
+            repo.git.merge('--ff-only', '@{upstream}')
+            return {'success': True, 'action': 'pulled'}
+        else:
+            return {
+                'success': False, 
+                'error': 'Local changes present',
+                'modified_files': [item.a_path for item in repo.index.diff(None)]
+            }
+    
     async def analyze_issues(self, repo_name: str) -> Dict:
         """Analyze repository issues using AI"""
         try:
@@ -237,15 +280,18 @@ class GitHubRepoManager:
                 'suggested_actions': []
             }
             
+            # PyGithub 2.x returns timezone-aware datetimes
+            now = datetime.now(timezone.utc)
+            
             # Categorize issues
+            by_label = analysis['by_label']
             for issue in issues:
-                for label in issue.labels:
-                    if label.name not in analysis['by_label']:
-                        analysis['by_label'][label.name] = 0
-                    analysis['by_label'][label.name] += 1
+                label_names = [label.name for label in issue.labels]
+                for name in label_names:
+                    by_label[name] = by_label.get(name, 0) + 1
                 
                 # Check for priority
-                if any(label.name in ['critical', 'high-priority', 'bug'] for label in issue.labels):
+                if not PRIORITY_LABELS.isdisjoint(label_names):
                     analysis['priority_issues'].append({
                         'number': issue.number,
                         'title': issue.title,
@@ -253,11 +299,12 @@ class GitHubRepoManager:
                     })
                 
                 # Check for stale issues (older than 30 days)
-                if (datetime.utcnow() - issue.created_at).days > 30:
+                days_old = (now - issue.created_at).days
+                if days_old > 30:
                     analysis['stale_issues'].append({
                         'number': issue.number,
                         'title': issue.title,
-                        'days_old': (datetime.utcnow() - issue.created_at).days
+                        'days_old': days_old
                     })
             
             # AI analysis for suggestions
@@ -296,12 +343,20 @@ class GitHubRepoManager:
         
         op_func = operations[operation]
         
-        for repo_name in repo_names:
-            try:
-                results[repo_name] = await op_func(repo_name, **kwargs)
-            except Exception as e:
-                results[repo_name] = {'error': str(e)}
+        # Repositories are independent, so they are processed a few at a time;
+        # dependency updates share package managers and caches and stay serial
+        limit = 1 if operation == 'update_deps' else self.config.get('batch_concurrency', 4)
+        semaphore = asyncio.Semaphore(limit)
+        
+        async def run(repo_name: str) -> Dict:
+            async with semaphore:
+                try:
+                    return await op_func(repo_name, **kwargs)
+                except Exception as e:
+                    return {'error': str(e)}
         
+        outcomes = await asyncio.gather(*(run(repo_name) for repo_name in repo_names))
+        results.update(zip(repo_names, outcomes))
         return results
     
     async def backup_repository(self, repo_name: str) -> Dict:
@@ -318,7 +373,7 @@ class GitHubRepoManager:
             backup_path = backup_dir / f"{repo_name}_{timestamp}.tar.gz"
             
             # Create backup
-            subprocess.run([
+            await asyncio.to_thread(subprocess.run, [
                 'tar', '-czf', str(backup_path), 
                 '-C', str(Path(repo_info['path']).parent), 
                 Path(repo_info['path']).name
@@ -2,26 +2,60 @@
 Advanced Security Manager for GitHub Repository Management
 """
 import os
+import re
 import json
 import base64
 import hashlib
 import secrets
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Set, FrozenSet, Iterable
 from datetime import datetime, timedelta
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import jwt
+import orjson
 import bcrypt
 from dataclasses import dataclass
 import aioredis
+import aiofiles
 import asyncio
-from functools import wraps
+from functools import wraps, lru_cache
+from collections import OrderedDict
 import logging
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+from ..utils.hashing import fast_hash
+
 logger = logging.getLogger(__name__)
 
+# Languages SecurityScanner recognises, by file suffix
+LANGUAGE_BY_SUFFIX = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'javascript',
+    '.java': 'java',
+    '.go': 'go',
+    '.rs': 'rust'
+}
+SCANNED_SUFFIXES = frozenset({'.py', '.js', '.ts', '.java'})
+SPECIAL_CHARACTERS = frozenset('!@#$%^&*()-_=+[]{}|;:,.<>?')
+AUDIT_FLUSH_EVENTS = 50  # buffered audit events before a write
+AUDIT_FLUSH_INTERVAL = 5.0  # longest a buffered audit event waits for a write
+MAX_REPEAT_NESTING = 1  # deeper nesting of unbounded repeats risks ReDoS
+SCAN_CACHE_SIZE = 4096  # per-file scan results kept by content hash
+PERMISSION_CACHE_SIZE = 1024  # (role set, permission) decisions remembered
+
 
 @dataclass
 class SecurityPolicy:
@@ -226,7 +260,7 @@ class AuthenticationManager:
         has_upper = any(c.isupper() for c in password)
         has_lower = any(c.islower() for c in password)
         has_digit = any(c.isdigit() for c in password)
-        has_special = any(c in '!@#$%^&*()-_=+[]{}|;:,.<>?' for c in password)
+        has_special = not SPECIAL_CHARACTERS.isdisjoint(password)
         
         return all([has_upper, has_lower, has_digit, has_special])
     
@@ -357,22 +391,31 @@ class AuditLogger:
         self.log_path = Path(log_path).expanduser()
         self.log_path.mkdir(parents=True, exist_ok=True)
         self.current_log = None
+        self._log_date = None
+        # Events are appended in batches rather than one open/write per event
+        self._buffer: List[bytes] = []
+        # Flushes write in the order they took their batch
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
         self._rotate_log()
     
     def _rotate_log(self):
         """Rotate audit log daily"""
-        date_str = datetime.utcnow().strftime("%Y%m%d")
-        self.current_log = self.log_path / f"audit_{date_str}.jsonl"
+        self._log_date = datetime.utcnow().date()
+        self.current_log = self.log_path / f"audit_{self._log_date:%Y%m%d}.jsonl"
     
     async def log_event(self, event: AuditEntry):
         """Log security event"""
-        # Rotate log if needed
-        if datetime.utcnow().date() != self.current_log.stat().st_mtime:
+        # Rotate log if needed; buffered events belong to the old day's file
+        if datetime.utcnow().date() != self._log_date:
+            await self.flush()
             self._rotate_log()
         
         # Write event
         event_data = {
-            'timestamp': event.timestamp.isoformat(),
+            # orjson renders datetimes itself, in the same ISO format
+            'timestamp': event.timestamp,
             'user_id': event.user_id,
             'action': event.action,
             'resource': event.resource,
@@ -381,19 +424,57 @@ class AuditLogger:
             'success': event.success,
             'details': event.details
         }
-        
-        async with aiofiles.open(self.current_log, 'a') as f:
-            await f.write(json.dumps(event_data) + '\n')
+        self._buffer.append(orjson.dumps(
+            event_data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        ))
+        
+        if len(self._buffer) >= AUDIT_FLUSH_EVENTS:
+            await self.flush()
+        elif self._flush_timer is None:
+            # Written within AUDIT_FLUSH_INTERVAL even if no other event follows
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                AUDIT_FLUSH_INTERVAL, self._on_flush_timer
+            )
+    
+    def _on_flush_timer(self):
+        self._flush_timer = None
+        self._flush_task = asyncio.create_task(self._timed_flush())
+    
+    async def _timed_flush(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing audit log: {e}")
+    
+    async def flush(self):
+        """Append buffered events to the current log file"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            data = b''.join(self._buffer)
+            self._buffer.clear()
+            # One worker-thread hop for open+write+close; aiofiles would
+            # dispatch each of those to the pool separately
+            await asyncio.to_thread(self._append, self.current_log, data)
+    
+    @staticmethod
+    def _append(path: Path, data: bytes):
+        with open(path, 'ab') as f:
+            f.write(data)
     
     async def search_events(self, filters: Dict) -> List[AuditEntry]:
         """Search audit logs"""
+        await self.flush()
         events = []
         
         # Search through log files
         for log_file in sorted(self.log_path.glob("audit_*.jsonl"), reverse=True):
             async with aiofiles.open(log_file, 'r') as f:
                 async for line in f:
-                    event_data = json.loads(line)
+                    event_data = orjson.loads(line)
                     
                     # Apply filters
                     if self._matches_filters(event_data, filters):
@@ -450,28 +531,44 @@ class RBACManager:
             }
         }
     
+        self.compile_policy()
+    
+    def compile_policy(self):
+        """Precompute per-role permission sets; call again after changing roles"""
+        self._role_permissions: Dict[str, FrozenSet[str]] = {
+            role: frozenset(spec['permissions']) for role, spec in self.roles.items()
+        }
+        self._superuser_roles = frozenset(
+            role for role, perms in self._role_permissions.items() if '*' in perms
+        )
+        # Bounded LRU keyed by the set of roles: the decision doesn't depend
+        # on their order or repetition
+        self._allowed_cache: OrderedDict = OrderedDict()
+    
     def check_permission(self, user_roles: List[str], required_permission: str) -> bool:
         """Check if user has required permission"""
+        key = (frozenset(user_roles), required_permission)
+        allowed = self._allowed_cache.get(key)
+        if allowed is None:
+            allowed = self._evaluate(key[0], required_permission)
+            self._allowed_cache[key] = allowed
+            if len(self._allowed_cache) > PERMISSION_CACHE_SIZE:
+                self._allowed_cache.popitem(last=False)
+        else:
+            self._allowed_cache.move_to_end(key)
+        return allowed
+    
+    def _evaluate(self, user_roles: FrozenSet[str], required_permission: str) -> bool:
+        candidates = _permission_candidates(required_permission)
         for role in user_roles:
-            if role not in self.roles:
-                continue
-            
-            role_perms = self.roles[role]['permissions']
-            
             # Check for wildcard
-            if '*' in role_perms:
+            if role in self._superuser_roles:
                 return True
             
-            # Check specific permission
-            if required_permission in role_perms:
+            # Check specific and wildcard permissions
+            role_perms = self._role_permissions.get(role)
+            if role_perms and not role_perms.isdisjoint(candidates):
                 return True
-            
-            # Check wildcard permissions
-            perm_parts = required_permission.split(':')
-            for i in range(len(perm_parts)):
-                wildcard_perm = ':'.join(perm_parts[:i+1] + ['*'])
-                if wildcard_perm in role_perms:
-                    return True
         
         return False
     
@@ -480,12 +577,25 @@ class RBACManager:
         permissions = set()
         
         for role in user_roles:
-            if role in self.roles:
-                permissions.update(self.roles[role]['permissions'])
+            permissions.update(self._role_permissions.get(role, ()))
         
         return permissions
 
 
+@lru_cache(maxsize=256)
+def _permission_candidates(permission: str) -> FrozenSet[str]:
+    """Permission strings that grant `permission`, e.g. repo:write -> repo:*"""
+    parts = permission.split(':')
+    candidates = {permission}
+    for i in range(len(parts)):
+        candidates.add(':'.join(parts[:i+1] + ['*']))
+    return frozenset(candidates)
+
+
+# Shared instance so authorization checks reuse the compiled policy
+_rbac = RBACManager()
+
+
 def require_auth(permission: str = None):
     """Decorator for authentication and authorization"""
     def decorator(func):
@@ -507,8 +617,7 @@ def require_auth(permission: str = None):
             
             # Check permission if specified
             if permission:
-                rbac = RBACManager()
-                if not rbac.check_permission(user_data['roles'], permission):
+                if not _rbac.check_permission(user_data['roles'], permission):
                     raise Exception(f"Permission denied: {permission}")
             
             # Add user context
@@ -533,12 +642,115 @@ def require_auth(permission: str = None):
     return decorator
 
 
+_REPEAT_OPS = frozenset(filter(None, (
+    sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, 'POSSESSIVE_REPEAT', None)
+)))
+
+
+def _repeat_nesting(items) -> int:
+    """Deepest nesting of repeats that can match more than once (star height)"""
+    deepest = 0
+    for op, av in items:
+        if op in _REPEAT_OPS:
+            _, hi, sub = av
+            deepest = max(deepest, _repeat_nesting(sub) + (hi > 1))
+        elif op is sre_parse.SUBPATTERN:
+            deepest = max(deepest, _repeat_nesting(av[-1]))
+        elif op is sre_parse.BRANCH:
+            deepest = max([deepest] + [_repeat_nesting(branch) for branch in av[1]])
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            deepest = max(deepest, _repeat_nesting(av[1]))
+        elif op is sre_parse.GROUPREF_EXISTS:
+            deepest = max(deepest, *(_repeat_nesting(b) for b in av[1:] if b))
+        elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            deepest = max(deepest, _repeat_nesting(av))
+    return deepest
+
+
+def _check_rule_pattern(pattern: str):
+    """Reject rule patterns prone to catastrophic backtracking, e.g. (a+)+"""
+    try:
+        nesting = _repeat_nesting(sre_parse.parse(pattern))
+    except re.error as e:
+        raise ValueError(f"Invalid rule pattern {pattern!r}: {e}") from e
+    if nesting > MAX_REPEAT_NESTING:
+        raise ValueError(f"Rule pattern {pattern!r} nests unbounded repeats")
+
+
 class SecurityScanner:
     """Security vulnerability scanner"""
     
-    def __init__(self):
+    def __init__(self, extra_rules: Optional[List[Dict]] = None):
         self.vulnerability_db = self._load_vulnerability_db()
-        self.security_rules = self._load_security_rules()
+        # Rules keyed by pattern: duplicates collapse (the first one wins)
+        # and rules can be added or removed without rebuilding a list
+        self._rules: Dict[str, Dict] = {}
+        # (generation, ((rule, regex), ...)) for the current rules. Scans run
+        # in worker threads while add_rule/remove_rule run on the event loop,
+        # so both are replaced whole rather than mutated, and a scan reads
+        # the pair once to get a consistent snapshot
+        self._rule_set: Tuple[int, Tuple[Tuple[Dict, Any], ...]] = (0, ())
+        self._scan_cache: OrderedDict = OrderedDict()
+        # Concurrent repository scans share the cache from worker threads
+        self._scan_cache_lock = threading.Lock()
+        for rule in self._load_security_rules() + list(extra_rules or []):
+            try:
+                self.add_rule(rule)
+            except ValueError as e:
+                logger.warning(f"Skipping security rule: {e}")
+    
+    @property
+    def security_rules(self) -> List[Dict]:
+        return list(self._rules.values())
+    
+    def add_rule(self, rule: Dict) -> bool:
+        """Add a scanning rule; False if a rule with that pattern exists
+
+        Raises ValueError for patterns that are invalid or prone to
+        catastrophic backtracking; the scanner is left unchanged.
+        """
+        pattern = rule['pattern']
+        if pattern in self._rules:
+            return False
+        # Compiled before anything is recorded, so a bad rule can't leave
+        # the scanner half-updated
+        regex = self._compile_rule(pattern)
+        generation, compiled = self._rule_set
+        self._rules = {**self._rules, pattern: rule}
+        self._set_rules(generation + 1, compiled + ((rule, regex),))
+        return True
+    
+    def remove_rule(self, pattern: str) -> bool:
+        """Remove the rule with the given pattern; False if there is none"""
+        if pattern not in self._rules:
+            return False
+        generation, compiled = self._rule_set
+        self._rules = {p: rule for p, rule in self._rules.items() if p != pattern}
+        self._set_rules(generation + 1, tuple(
+            (rule, regex) for rule, regex in compiled if rule['pattern'] != pattern
+        ))
+        return True
+    
+    def _set_rules(self, generation: int, compiled: Tuple[Tuple[Dict, Any], ...]):
+        self._rule_set = (generation, compiled)
+        # Cached findings were produced by the previous rule set
+        with self._scan_cache_lock:
+            self._scan_cache.clear()
+    
+    @staticmethod
+    def _compile_rule(pattern: str):
+        """Compile with RE2 when available: it scans in linear time, so
+        repository content can't trigger catastrophic backtracking"""
+        _check_rule_pattern(pattern)
+        if re2 is not None:
+            try:
+                return re2.compile(pattern)
+            except re2.error:
+                logger.warning(f"RE2 can't compile security rule {pattern!r}; falling back to re")
+        try:
+            return re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid rule pattern {pattern!r}: {e}") from e
     
     def _load_vulnerability_db(self) -> Dict:
         """Load known vulnerabilities"""
@@ -578,6 +790,25 @@ class SecurityScanner:
     
     async def scan_repository(self, repo_path: Path) -> Dict[str, List[Dict]]:
         """Scan repository for security vulnerabilities"""
+        # The walk, reads and regex scans are all blocking CPU/disk work with
+        # nothing to await, so the whole scan runs in one worker thread
+        return await asyncio.to_thread(self._scan_repository, repo_path)
+    
+    async def scan_files(self, file_paths: Iterable[Path]) -> Dict[str, List[Dict]]:
+        """Scan a batch of files, such as a change set, for vulnerabilities
+        
+        The whole batch is read and scanned in one worker-thread hop; results
+        are grouped by severity like scan_repository's.
+        """
+        return await asyncio.to_thread(self._scan_paths, [Path(p) for p in file_paths])
+    
+    def _scan_repository(self, repo_path: Path) -> Dict[str, List[Dict]]:
+        return self._scan_paths(
+            file_path for file_path in repo_path.rglob('*')
+            if file_path.suffix in SCANNED_SUFFIXES and file_path.is_file()
+        )
+    
+    def _scan_paths(self, file_paths: Iterable[Path]) -> Dict[str, List[Dict]]:
         vulnerabilities = {
             'critical': [],
             'high': [],
@@ -585,48 +816,68 @@ class SecurityScanner:
             'low': []
         }
         
-        for file_path in repo_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix in ['.py', '.js', '.ts', '.java']:
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        
-                    # Scan for vulnerabilities
-                    file_vulns = await self._scan_file(file_path, content)
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+                    
+                # Scan for vulnerabilities
+                file_vulns = self._scan_file(file_path, content)
+                
+                for vuln in file_vulns:
+                    vulnerabilities[vuln['severity']].append(vuln)
                     
-                    for vuln in file_vulns:
-                        vulnerabilities[vuln['severity']].append(vuln)
-                        
-                except Exception as e:
-                    logger.error(f"Error scanning {file_path}: {e}")
+            except Exception as e:
+                logger.error(f"Error scanning {file_path}: {e}")
         
         return vulnerabilities
     
-    async def _scan_file(self, file_path: Path, content: str) -> List[Dict]:
+    def _scan_file(self, file_path: Path, content: str) -> List[Dict]:
         """Scan individual file for vulnerabilities"""
+        language = self._detect_language(file_path)
+        generation, rules = self._rule_set
+        
+        # Findings depend only on the rule set, the language and the text, so
+        # identical files (vendored copies, unchanged files on a rescan) are
+        # scanned once
+        key = (generation, language, fast_hash(content.encode()))
+        with self._scan_cache_lock:
+            findings = self._scan_cache.get(key)
+            if findings is not None:
+                self._scan_cache.move_to_end(key)
+        if findings is None:
+            findings = self._scan_content(language, content, rules)
+            with self._scan_cache_lock:
+                # Rules changed mid-scan: these findings are already stale
+                if self._rule_set[0] == generation:
+                    self._scan_cache[key] = findings
+                    if len(self._scan_cache) > SCAN_CACHE_SIZE:
+                        self._scan_cache.popitem(last=False)
+        
+        file_name = str(file_path)
+        return [{'file': file_name, **finding} for finding in findings]
+    
+    def _scan_content(self, language: str, content: str,
+                      rules: Tuple[Tuple[Dict, Any], ...]) -> List[Dict]:
         vulnerabilities = []
         
         # Check for known vulnerable patterns
-        language = self._detect_language(file_path)
-        if language in self.vulnerability_db:
-            for pattern, info in self.vulnerability_db[language].items():
-                if pattern in content:
-                    vulnerabilities.append({
-                        'file': str(file_path),
-                        'type': 'vulnerable_function',
-                        'pattern': pattern,
-                        'severity': info['severity'],
-                        'description': info['description'],
-                        'line': self._find_line_number(content, pattern)
-                    })
+        # Only the bucket for this file's language is checked
+        language_vulns = self.vulnerability_db.get(language, {})
+        for pattern, info in language_vulns.items():
+            if pattern in content:
+                vulnerabilities.append({
+                    'type': 'vulnerable_function',
+                    'pattern': pattern,
+                    'severity': info['severity'],
+                    'description': info['description'],
+                    'line': self._find_line_number(content, pattern)
+                })
         
         # Check security rules
-        for rule in self.security_rules:
-            import re
-            matches = re.finditer(rule['pattern'], content)
-            for match in matches:
+        for rule, regex in rules:
+            for match in regex.finditer(content):
                 vulnerabilities.append({
-                    'file': str(file_path),
                     'type': 'security_rule',
                     'pattern': rule['pattern'],
                     'severity': rule['severity'],
@@ -639,15 +890,7 @@ class SecurityScanner:
     
     def _detect_language(self, file_path: Path) -> str:
         """Detect programming language from file extension"""
-        ext_map = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'javascript',
-            '.java': 'java',
-            '.go': 'go',
-            '.rs': 'rust'
-        }
-        return ext_map.get(file_path.suffix, 'unknown')
+        return LANGUAGE_BY_SUFFIX.get(file_path.suffix, 'unknown')
     
     def _find_line_number(self, content: str, pattern: str) -> int:
         """Find line number of pattern in content"""
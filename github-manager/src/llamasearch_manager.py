@@ -22,6 +22,7 @@ from .core.repo_manager import GitHubRepoManager
 from .core.mcp_client import MCPClient
 from .core.ollama_interface import OllamaInterface
 from .utils.logger import setup_logger
+from .utils.requirements import requirement_names
 
 logger = setup_logger(__name__)
 
@@ -138,8 +139,11 @@ class LlamaSearchManager(GitHubRepoManager):
                     # Update existing repo
                     logger.info(f"Updating {repo_name}...")
                     repo = git.Repo(local_path)
-                    origin = repo.remote('origin')
-                    origin.pull()
+                    # Fetch and fast-forward rather than pull: no merge
+                    # commits, and a diverged checkout fails instead of
+                    # being merged into
+                    repo.remote('origin').fetch()
+                    repo.git.merge('--ff-only', '@{upstream}')
                     results[repo_name] = f"Updated at {local_path}"
                 else:
                     # Clone new repo
@@ -369,28 +373,13 @@ The LlamaSearchAI organization contains {len(results)} repositories focused on b
 
 """
         
-        # Analyze each repository with AI
-        for repo_name in list(results.keys())[:5]:  # Limit to first 5 for summary
-            if repo_name in self.repo_metadata:
-                repo_info = self.repo_metadata[repo_name]
-                
-                # Use Ollama to analyze
-                analysis_prompt = f"""
-                Analyze this repository and provide a brief summary:
-                Name: {repo_name}
-                Description: {repo_info.get('description', 'N/A')}
-                Language: {repo_info.get('language', 'Unknown')}
-                Topics: {', '.join(repo_info.get('topics', []))}
-                
-                Provide a 2-3 sentence summary of its purpose and key features.
-                """
-                
-                try:
-                    analysis = await self.ollama.analyze_text(analysis_prompt)
-                    summary_content += f"### {repo_name}\n{analysis}\n\n"
-                except Exception as e:
-                    logger.error(f"Failed to analyze {repo_name}: {e}")
-                    summary_content += f"### {repo_name}\n{repo_info.get('description', 'No description available')}\n\n"
+        # Analyze the first five repositories with AI in a single request
+        summary_repos = [
+            name for name in list(results.keys())[:5] if name in self.repo_metadata
+        ]
+        summaries = await self._summarize_repositories(summary_repos)
+        for repo_name in summary_repos:
+            summary_content += f"### {repo_name}\n{summaries[repo_name]}\n\n"
         
         # Add architecture overview
         summary_content += """
@@ -414,6 +403,52 @@ These components work together to provide a comprehensive AI-powered search and
         logger.info(f"Generated index at: {index_file}")
         logger.info(f"Generated summary at: {summary_file}")
     
+    def _describe_repository(self, repo_name: str) -> str:
+        repo_info = self.repo_metadata[repo_name]
+        return f"""
+                Name: {repo_name}
+                Description: {repo_info.get('description', 'N/A')}
+                Language: {repo_info.get('language', 'Unknown')}
+                Topics: {', '.join(repo_info.get('topics', []))}
+                """
+    
+    async def _summarize_repositories(self, repo_names: List[str]) -> Dict[str, str]:
+        """Summarize repositories with one model call, falling back to one call each"""
+        if not repo_names:
+            return {}
+        
+        batch_prompt = f"""
+                Summarize each of these repositories in 2-3 sentences covering its
+                purpose and key features.
+                {''.join(self._describe_repository(name) for name in repo_names)}
+                Respond with a JSON object mapping each repository name to its summary.
+                """
+        try:
+            summaries = await self.ollama.analyze_json(batch_prompt)
+            if isinstance(summaries, dict) and all(
+                isinstance(summaries.get(name), str) for name in repo_names
+            ):
+                return {name: summaries[name] for name in repo_names}
+            logger.warning("Batched summary response was incomplete, summarizing individually")
+        except Exception as e:
+            logger.warning(f"Batched summary failed, summarizing individually: {e}")
+        
+        summaries = {}
+        for repo_name in repo_names:
+            analysis_prompt = f"""
+                Analyze this repository and provide a brief summary:
+                {self._describe_repository(repo_name)}
+                Provide a 2-3 sentence summary of its purpose and key features.
+                """
+            try:
+                summaries[repo_name] = await self.ollama.analyze_text(analysis_prompt)
+            except Exception as e:
+                logger.error(f"Failed to analyze {repo_name}: {e}")
+                summaries[repo_name] = self.repo_metadata[repo_name].get(
+                    'description', 'No description available'
+                )
+        return summaries
+    
     async def update_repository(self, repo_name: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update repository with new content or settings"""
         try:
@@ -549,11 +584,7 @@ These components work together to provide a comprehensive AI-powered search and
             if req_path.exists():
                 try:
                     with open(req_path, 'r') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and not line.startswith('#'):
-                                dep = line.split('==')[0].split('>=')[0].split('<=')[0].strip()
-                                deps['python'].add(dep)
+                        deps['python'].update(requirement_names(f))
                 except Exception as e:
                     logger.error(f"Error reading {req_file}: {e}")
         
@@ -8,7 +8,7 @@ import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import git
 from github import Github
 import yaml
@@ -17,7 +17,7 @@ import logging
 # Import all our advanced modules
 from .core.repo_manager import GitHubRepoManager
 from .core.security_manager import (
-    SecureTokenStorage, AuthenticationManager, AuditLogger, 
+    SecureTokenStorage, AuthenticationManager, AuditLogger, AuditEntry,
     SecurityScanner, RBACManager, require_auth
 )
 from .core.performance_optimizer import (
@@ -71,6 +71,12 @@ class LlamaSearchAdvancedManager(GitHubRepoManager):
         self.operation_metrics = []
         self.health_scores = {}
         
+        # Background monitors, kept referenced so they aren't garbage
+        # collected mid-run and can be cancelled on cleanup; health checks
+        # share one concurrency limit so a large org doesn't burst the API
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._health_check_limit = asyncio.Semaphore(8)
+        
     async def initialize(self):
         """Initialize all components with advanced features"""
         await super().initialize()
@@ -88,9 +94,10 @@ class LlamaSearchAdvancedManager(GitHubRepoManager):
         await self._load_advanced_config()
         
         # Start background tasks
-        asyncio.create_task(self._health_monitor())
-        asyncio.create_task(self._security_monitor())
-        asyncio.create_task(self._performance_monitor())
+        for monitor in (self._health_monitor, self._security_monitor, self._performance_monitor):
+            task = asyncio.create_task(monitor())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
         
         logger.info("LlamaSearchAI Advanced Manager initialized")
     
@@ -111,16 +118,16 @@ class LlamaSearchAdvancedManager(GitHubRepoManager):
         user = kwargs.get('user')
         
         # Audit log
-        await self.security['audit_logger'].log_event({
-            'timestamp': datetime.utcnow(),
-            'user_id': user['username'],
-            'action': 'scan_organization',
-            'resource': self.org_name,
-            'ip_address': kwargs.get('ip_address'),
-            'user_agent': kwargs.get('user_agent'),
-            'success': True,
-            'details': {}
-        })
+        await self.security['audit_logger'].log_event(AuditEntry(
+            timestamp=datetime.utcnow(),
+            user_id=user['username'],
+            action='scan_organization',
+            resource=self.org_name,
+            ip_address=kwargs.get('ip_address'),
+            user_agent=kwargs.get('user_agent'),
+            success=True,
+            details={}
+        ))
         
         # Use cache if available
         cache_key = f"org_scan:{self.org_name}"
@@ -177,7 +184,7 @@ class LlamaSearchAdvancedManager(GitHubRepoManager):
         
         # Activity check
         last_update = repo.updated_at
-        days_inactive = (datetime.utcnow() - last_update).days
+        days_inactive = (datetime.now(timezone.utc) - last_update).days
         if days_inactive > 180:
             score -= 20
         elif days_inactive > 90:
@@ -813,13 +820,12 @@ This PR contains automated fixes for security vulnerabilities detected in the re
         """Background task for continuous health monitoring"""
         while True:
             try:
-                for repo_name in self.repo_metadata.keys():
-                    health = await self._calculate_repo_health_advanced(repo_name)
-                    self.health_scores[repo_name] = health
-                    
-                    # Alert if health drops significantly
-                    if health < 50:
-                        await self._send_health_alert(repo_name, health)
+                # Snapshot the names: the metadata can be rescanned while
+                # checks are in flight
+                await asyncio.gather(*(
+                    self._check_repo_health(repo_name)
+                    for repo_name in list(self.repo_metadata)
+                ))
                 
                 await asyncio.sleep(3600)  # Check hourly
                 
@@ -827,6 +833,16 @@ This PR contains automated fixes for security vulnerabilities detected in the re
                 logger.error(f"Health monitor error: {e}")
                 await asyncio.sleep(60)
     
+    async def _check_repo_health(self, repo_name: str):
+        """Score one repository and alert on low health"""
+        async with self._health_check_limit:
+            health = await self._calculate_repo_health_advanced(repo_name)
+        self.health_scores[repo_name] = health
+        
+        # Alert if health drops significantly
+        if health < 50:
+            await self._send_health_alert(repo_name, health)
+    
     async def _calculate_repo_health_advanced(self, repo_name: str) -> float:
         """Advanced repository health calculation"""
         # More sophisticated health scoring
@@ -916,6 +932,11 @@ This PR contains automated fixes for security vulnerabilities detected in the re
     
     async def cleanup(self):
         """Cleanup all resources"""
+        for task in list(self._background_tasks):
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        
+        await self.security['audit_logger'].flush()
         await super().cleanup()
         await self.performance.cleanup()
         # Clean up other resources
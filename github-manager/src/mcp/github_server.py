@@ -8,13 +8,15 @@ from typing import Dict, List, Any, Optional
 import websockets
 from github import Github, GithubException
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timezone
 import base64
 
 logger = logging.getLogger(__name__)
 
+PRIORITY_LABELS = frozenset({'critical', 'high-priority', 'bug'})
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class MCPMessage:
     type: str
     id: Optional[str] = None
@@ -26,11 +28,16 @@ class MCPMessage:
 
 class GitHubMCPServer:
     def __init__(self, github_token: str, port: int = 3001):
-        self.github = Github(github_token)
+        # 100 is the API maximum; full listings take a third of the requests
+        self.github = Github(github_token, per_page=100)
         self.port = port
         self.tools = {}
         self._setup_tools()
         self.monitors = {}
+        self.message_handlers = {
+            'initialize': self.handle_initialize,
+            'tool_call': self.handle_tool_call
+        }
         
     def _setup_tools(self):
         """Setup available GitHub tools"""
@@ -87,12 +94,11 @@ class GitHubMCPServer:
             data = json.loads(message)
             msg = MCPMessage(**data)
             
-            if msg.type == 'initialize':
-                await self.handle_initialize(websocket, msg)
-            elif msg.type == 'tool_call':
-                await self.handle_tool_call(websocket, msg)
-            else:
+            handler = self.message_handlers.get(msg.type)
+            if handler is None:
                 await self.send_error(websocket, msg.id, f"Unknown message type: {msg.type}")
+            else:
+                await handler(websocket, msg)
                 
         except json.JSONDecodeError:
             await self.send_error(websocket, None, "Invalid JSON")
@@ -118,13 +124,14 @@ class GitHubMCPServer:
         tool_name = msg.tool
         params = msg.params or {}
         
-        if tool_name not in self.tools:
+        tool = self.tools.get(tool_name)
+        if tool is None:
             await self.send_error(websocket, msg.id, f"Unknown tool: {tool_name}")
             return
         
         try:
             # Execute tool
-            result = await self.tools[tool_name](**params)
+            result = await tool(**params)
             
             response = MCPMessage(
                 type='tool_result',
@@ -218,28 +225,31 @@ class GitHubMCPServer:
                 'contributors': set()
             }
             
+            # PyGithub 2.x returns timezone-aware datetimes
+            now = datetime.now(timezone.utc)
+            
+            issues_by_label = analysis['issues_by_label']
             for issue in issues:
                 # Track contributors
                 if issue.user:
                     analysis['contributors'].add(issue.user.login)
                 
                 # Categorize by labels
-                for label in issue.labels:
-                    if label.name not in analysis['issues_by_label']:
-                        analysis['issues_by_label'][label.name] = 0
-                    analysis['issues_by_label'][label.name] += 1
+                label_names = [label.name for label in issue.labels]
+                for name in label_names:
+                    issues_by_label[name] = issues_by_label.get(name, 0) + 1
                 
                 # Identify priority issues
-                if any(label.name in ['critical', 'high-priority', 'bug'] for label in issue.labels):
+                if not PRIORITY_LABELS.isdisjoint(label_names):
                     analysis['priority_issues'].append({
                         'number': issue.number,
                         'title': issue.title,
                         'created_at': issue.created_at.isoformat(),
-                        'labels': [l.name for l in issue.labels]
+                        'labels': label_names
                     })
                 
                 # Check for stale issues
-                days_old = (datetime.utcnow() - issue.created_at).days
+                days_old = (now - issue.created_at).days
                 if days_old > 30:
                     analysis['stale_issues'].append({
                         'number': issue.number,
@@ -393,7 +403,7 @@ class GitHubMCPServer:
             }
             
             # Get commit activity
-            commits = list(repo.get_commits()[:100])  # Last 100 commits
+            commits = list(repo.get_commits()[:100])  # Last 100 commits, one page
             insights['activity']['commits'] = len(commits)
             
             # Get recent commits
@@ -405,9 +415,9 @@ class GitHubMCPServer:
                     'date': commit.commit.author.date.isoformat()
                 })
             
-            # Get contributors
-            contributors = list(repo.get_contributors())
-            for contrib in contributors[:10]:
+            # Get contributors (slicing the PaginatedList only fetches the
+            # first page instead of every contributor)
+            for contrib in repo.get_contributors()[:10]:
                 insights['activity']['contributors'].append({
                     'login': contrib.login,
                     'contributions': contrib.contributions
@@ -586,7 +596,7 @@ class GitHubMCPServer:
         # In a real implementation, this would set up webhooks or polling
         self.monitors[repo_name] = {
             'events': events,
-            'started_at': datetime.utcnow().isoformat()
+            'started_at': datetime.now(timezone.utc).isoformat()
         }
         
         return {
@@ -684,26 +694,47 @@ class GitHubMCPServer:
     async def get_repository_stats(self, repo_name: str) -> Dict:
         """Get repository statistics"""
         try:
-            repo = self.github.get_repo(repo_name)
+            repo = await asyncio.to_thread(self.github.get_repo, repo_name)
+            
+            # Each totalCount is its own blocking request; issue them
+            # concurrently from worker threads instead of one after another
+            listings = (
+                repo.get_contributors(),
+                repo.get_commits(),
+                repo.get_branches(),
+                repo.get_tags(),
+                repo.get_releases(),
+                repo.get_issues(state='open'),
+                repo.get_issues(state='closed'),
+                repo.get_pulls(state='open'),
+                repo.get_pulls(state='closed'),
+                repo.get_milestones(state='open'),
+                repo.get_milestones(state='closed')
+            )
+            (contributors, commits, branches, tags, releases,
+             open_issues, closed_issues, open_pulls, closed_pulls,
+             open_milestones, closed_milestones) = await asyncio.gather(*(
+                asyncio.to_thread(getattr, listing, 'totalCount') for listing in listings
+            ))
             
             # Get various stats
             stats = {
-                'contributors': repo.get_contributors().totalCount,
-                'commits': repo.get_commits().totalCount,
-                'branches': repo.get_branches().totalCount,
-                'tags': repo.get_tags().totalCount,
-                'releases': repo.get_releases().totalCount,
+                'contributors': contributors,
+                'commits': commits,
+                'branches': branches,
+                'tags': tags,
+                'releases': releases,
                 'issues': {
-                    'open': repo.get_issues(state='open').totalCount,
-                    'closed': repo.get_issues(state='closed').totalCount
+                    'open': open_issues,
+                    'closed': closed_issues
                 },
                 'pull_requests': {
-                    'open': repo.get_pulls(state='open').totalCount,
-                    'closed': repo.get_pulls(state='closed').totalCount
+                    'open': open_pulls,
+                    'closed': closed_pulls
                 },
                 'milestones': {
-                    'open': repo.get_milestones(state='open').totalCount,
-                    'closed': repo.get_milestones(state='closed').totalCount
+                    'open': open_milestones,
+                    'closed': closed_milestones
                 }
             }
             
@@ -3,5 +3,7 @@ Utility modules
 """
 from .config import ConfigManager
 from .logger import setup_logger
+from .hashing import fast_hash
+from .requirements import requirement_name, requirement_names
 
-__all__ = ['ConfigManager', 'setup_logger']
\ No newline at end of file
+__all__ = ['ConfigManager', 'setup_logger', 'fast_hash', 'requirement_name', 'requirement_names']
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""
+Fast non-cryptographic hashing for cache keys
+"""
+import hashlib
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+def fast_hash(data: bytes) -> str:
+    """Hash bytes for use as a cache or dedupe key (not for security)"""
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
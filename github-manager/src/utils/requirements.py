@@ -0,0 +1,27 @@
+"""
+Lightweight requirements.txt parsing
+"""
+import re
+from typing import Iterable, List, Optional
+
+# Everything after the project name: version specifiers, extras, environment
+# markers, inline comments
+_REQ_SPLIT = re.compile(r'[=<>!~;#\s\[@]')
+
+
+def requirement_name(line: str) -> Optional[str]:
+    """Project name from one requirements line, or None for comments and options"""
+    line = line.strip()
+    # Blank lines, comments and pip options (-r, -e, --hash, ...)
+    if not line or line[0] in '#-':
+        return None
+    name = _REQ_SPLIT.split(line, 1)[0]
+    # A bare URL has no name in front of it ("pkg@https://..." does)
+    if not name or '://' in name:
+        return None
+    return name
+
+
+def requirement_names(lines: Iterable[str]) -> List[str]:
+    """Project names from requirements lines, skipping anything that isn't a requirement"""
+    return [name for name in map(requirement_name, lines) if name]
@@ -3,13 +3,15 @@ Web Dashboard for GitHub Repository Manager
 """
 from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from cachetools import TTLCache
 from typing import Dict, List, Optional, Any
 import json
 import asyncio
-from datetime import datetime
+import uuid
 from pathlib import Path
 
 from ..core.repo_manager import GitHubRepoManager
@@ -39,9 +41,17 @@ class CreateRepoRequest(BaseModel):
     private: bool = False
 
 
+# Validators for WebSocket payloads, built once at import
+_repo_analysis_adapter = TypeAdapter(RepoAnalysisRequest)
+_command_adapter = TypeAdapter(CommandRequest)
+
+
 def create_app(config_path: str = "config/github_config.yaml"):
     app = FastAPI(title="GitHub Repository Manager")
     
+    # Repository listings and analysis results can be large JSON bodies
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+    
     # Initialize manager
     manager = GitHubRepoManager(config_path)
     
@@ -52,7 +62,18 @@ def create_app(config_path: str = "config/github_config.yaml"):
     app.mount("/static", StaticFiles(directory="src/web/static"), name="static")
     
     # Store WebSocket connections
-    connections = []
+    connections = set()
+    
+    # Dashboard polling hits the repository listing constantly; a short-lived
+    # cache avoids re-walking the repos directory on every request.
+    repo_listing_cache = TTLCache(maxsize=1, ttl=2.0)
+    
+    def list_repos_cached() -> List[Dict]:
+        repos = repo_listing_cache.get('repos')
+        if repos is None:
+            repos = manager.scan_local_repositories()
+            repo_listing_cache['repos'] = repos
+        return repos
     
     @app.on_event("startup")
     async def startup_event():
@@ -65,7 +86,7 @@ def create_app(config_path: str = "config/github_config.yaml"):
     
     @app.get("/", response_class=HTMLResponse)
     async def dashboard():
-        repos = manager.scan_local_repositories()
+        repos = list_repos_cached()
         return templates.TemplateResponse("dashboard.html", {
             "request": {},
             "repositories": repos,
@@ -75,7 +96,7 @@ def create_app(config_path: str = "config/github_config.yaml"):
     
     @app.get("/api/repositories")
     async def list_repositories():
-        repos = manager.scan_local_repositories()
+        repos = list_repos_cached()
         return JSONResponse(content=repos)
     
     @app.get("/api/repository/{repo_name}")
@@ -85,10 +106,21 @@ def create_app(config_path: str = "config/github_config.yaml"):
             raise HTTPException(status_code=404, detail="Repository not found")
         return JSONResponse(content=repo_info)
     
+    async def run_analysis(request: RepoAnalysisRequest) -> Dict:
+        """Shared by the HTTP route and the WebSocket handler"""
+        return await manager.ai_analyze_repository(request.repo_path)
+    
+    async def run_command(request: CommandRequest) -> Dict:
+        """Shared by the HTTP route and the WebSocket handler"""
+        return await manager.ollama.analyze_code_with_tools(
+            request.repo or ".",
+            request.command
+        )
+    
     @app.post("/api/repository/{repo_name}/analyze")
     async def analyze_repository(repo_name: str, request: RepoAnalysisRequest):
         try:
-            result = await manager.ai_analyze_repository(request.repo_path)
+            result = await run_analysis(request)
             return JSONResponse(content=result)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -97,6 +129,7 @@ def create_app(config_path: str = "config/github_config.yaml"):
     async def sync_repository(repo_name: str):
         try:
             result = await manager.sync_repository(repo_name)
+            repo_listing_cache.clear()
             return JSONResponse(content=result)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -117,6 +150,7 @@ def create_app(config_path: str = "config/github_config.yaml"):
                 request.description,
                 request.private
             )
+            repo_listing_cache.clear()
             return JSONResponse(content=result)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -125,13 +159,14 @@ def create_app(config_path: str = "config/github_config.yaml"):
     async def batch_operation(request: BatchOperationRequest, background_tasks: BackgroundTasks):
         try:
             # Run batch operation in background
-            task_id = f"batch_{datetime.now().timestamp()}"
+            task_id = f"batch_{uuid.uuid4().hex}"
             
             async def run_batch():
                 result = await manager.batch_operation(
                     request.operation,
                     request.repositories
                 )
+                repo_listing_cache.clear()
                 # Store result or send via WebSocket
                 await notify_clients({
                     'type': 'batch_complete',
@@ -151,10 +186,7 @@ def create_app(config_path: str = "config/github_config.yaml"):
     @app.post("/api/command")
     async def execute_command(request: CommandRequest):
         try:
-            result = await manager.ollama.analyze_code_with_tools(
-                request.repo or ".",
-                request.command
-            )
+            result = await run_command(request)
             return JSONResponse(content=result)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -170,15 +202,17 @@ def create_app(config_path: str = "config/github_config.yaml"):
     @app.websocket("/ws")
     async def websocket_endpoint(websocket: WebSocket):
         await websocket.accept()
-        connections.append(websocket)
+        connections.add(websocket)
         
         try:
             while True:
                 data = await websocket.receive_text()
                 request = json.loads(data)
                 
+                # Messages are validated once here and handed to the shared
+                # helpers, not routed back through the HTTP endpoints.
                 if request['type'] == 'analyze_repo':
-                    result = await manager.ai_analyze_repository(request['repo_path'])
+                    result = await run_analysis(_repo_analysis_adapter.validate_python(request))
                     await websocket.send_json({
                         'type': 'analysis_result',
                         'data': result
@@ -202,10 +236,7 @@ def create_app(config_path: str = "config/github_config.yaml"):
                     )
                 
                 elif request['type'] == 'execute_command':
-                    result = await manager.ollama.analyze_code_with_tools(
-                        request.get('repo', '.'),
-                        request['command']
-                    )
+                    result = await run_command(_command_adapter.validate_python(request))
                     await websocket.send_json({
                         'type': 'command_result',
                         'data': result
@@ -214,15 +245,21 @@ def create_app(config_path: str = "config/github_config.yaml"):
         except Exception as e:
             logger.error(f"WebSocket error: {e}")
         finally:
-            connections.remove(websocket)
+            connections.discard(websocket)
     
     async def notify_clients(message: Dict):
         """Notify all connected WebSocket clients"""
-        for connection in connections:
-            try:
-                await connection.send_json(message)
-            except:
-                pass
+        targets = list(connections)
+        results = await asyncio.gather(
+            *(connection.send_json(message) for connection in targets),
+            return_exceptions=True
+        )
+        
+        # Drop sockets that failed so later broadcasts skip them
+        dead = [conn for conn, result in zip(targets, results) if isinstance(result, Exception)]
+        if dead:
+            logger.debug(f"Dropping {len(dead)} dead WebSocket connection(s)")
+            connections.difference_update(dead)
     
     def get_language_stats(repos: List[Dict]) -> Dict[str, int]:
         """Calculate language statistics across repositories"""
@@ -234,7 +271,7 @@ def create_app(config_path: str = "config/github_config.yaml"):
     
     @app.get("/api/stats")
     async def get_statistics():
-        repos = manager.scan_local_repositories()
+        repos = list_repos_cached()
         
         stats = {
             'total_repositories': len(repos),
@@ -260,9 +297,10 @@ def create_app(config_path: str = "config/github_config.yaml"):
     
     @app.get("/api/mcp/status")
     async def get_mcp_status():
-        status = {}
-        for server_name in ['github', 'filesystem', 'project']:
-            status[server_name] = await manager.mcp_client.get_server_status(server_name)
-        return JSONResponse(content=status)
+        server_names = ['github', 'filesystem', 'project']
+        results = await asyncio.gather(
+            *(manager.mcp_client.get_server_status(name) for name in server_names)
+        )
+        return JSONResponse(content=dict(zip(server_names, results)))
     
     return app
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""
+Pytest configuration.
+"""
+
+import sys
+from pathlib import Path
+
+# Make the src package importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
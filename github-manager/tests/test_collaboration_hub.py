@@ -0,0 +1,108 @@
+"""
+Tests for workflow dependency indexing and scheduling.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.collaboration_hub import (
+    ActionType, Workflow, WorkflowEngine, WorkflowStatus, WorkflowStep
+)
+
+
+def _step(step_id, *dependencies):
+    return WorkflowStep(
+        id=step_id,
+        name=step_id,
+        action=ActionType.CODE_ANALYSIS,
+        params={},
+        dependencies=list(dependencies),
+    )
+
+
+class TestBuildDependencyIndex:
+    """Tests for WorkflowEngine._build_dependency_index."""
+    
+    def test_diamond(self):
+        """Test pending dependencies and dependents for a diamond."""
+        steps = [_step("a"), _step("b", "a"), _step("c", "a"), _step("d", "b", "c")]
+        
+        remaining_deps, dependents = WorkflowEngine()._build_dependency_index(steps)
+        
+        assert remaining_deps == {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"b", "c"}}
+        assert dependents == {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": []}
+    
+    def test_unknown_dependency(self):
+        """Test a dependency on a missing step is rejected."""
+        steps = [_step("a"), _step("b", "missing")]
+        
+        with pytest.raises(ValueError, match="unknown step missing"):
+            WorkflowEngine()._build_dependency_index(steps)
+    
+    @pytest.mark.parametrize("steps", [
+        [_step("a", "a")],
+        [_step("a", "b"), _step("b", "a")],
+        [_step("root"), _step("a", "root", "c"), _step("b", "a"), _step("c", "b")],
+    ])
+    def test_cycle(self, steps):
+        """Test circular dependencies are rejected."""
+        with pytest.raises(ValueError, match="circular"):
+            WorkflowEngine()._build_dependency_index(steps)
+
+
+class TestRunWorkflow:
+    """Tests for WorkflowEngine._run_workflow scheduling."""
+    
+    def _run(self, engine, steps):
+        ran = []
+        
+        async def executor(params, context):
+            ran.append(params['name'])
+            await asyncio.sleep(0)
+            if params.get('fail'):
+                raise RuntimeError("step failed")
+        
+        engine.executors[ActionType.CODE_ANALYSIS] = executor
+        workflow = Workflow(id="wf", name="wf", description="", triggers=[], steps=steps)
+        workflow.status = WorkflowStatus.RUNNING
+        asyncio.run(engine._run_workflow(workflow, {}))
+        return workflow, ran
+    
+    def test_failure_stops_queued_steps(self):
+        """Test steps waiting on the semaphore don't start after a failure."""
+        steps = [_step(name) for name in "abcd"]
+        for step in steps:
+            step.params = {'name': step.id}
+        steps[0].params['fail'] = True
+        
+        workflow, ran = self._run(WorkflowEngine(max_parallel=1), steps)
+        
+        assert ran == ["a"]
+        assert workflow.status == WorkflowStatus.FAILED
+        assert [step.status for step in steps[1:]] == [WorkflowStatus.CANCELLED] * 3
+    
+    def test_continue_on_failure(self):
+        """Test a step allowed to fail doesn't stop the others."""
+        steps = [_step(name) for name in "abc"]
+        for step in steps:
+            step.params = {'name': step.id}
+        steps[0].params['fail'] = True
+        steps[0].retry_policy = {'continue_on_failure': True}
+        
+        workflow, ran = self._run(WorkflowEngine(max_parallel=1), steps)
+        
+        assert ran == ["a", "b", "c"]
+        assert workflow.status == WorkflowStatus.SUCCESS
+    
+    def test_dependents_not_scheduled_after_failure(self):
+        """Test a failed step's dependents are never dispatched."""
+        steps = [_step("a"), _step("b", "a")]
+        for step in steps:
+            step.params = {'name': step.id}
+        steps[0].params['fail'] = True
+        
+        workflow, ran = self._run(WorkflowEngine(), steps)
+        
+        assert ran == ["a"]
+        assert steps[1].status == WorkflowStatus.PENDING
@@ -0,0 +1,214 @@
+"""
+Tests for the TinyLFU sketch, AdaptiveCache and ParallelExecutor.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core import performance_optimizer
+from src.core.performance_optimizer import AdaptiveCache, FrequencySketch, ParallelExecutor
+
+
+class TestFrequencySketch:
+    """Tests for FrequencySketch."""
+    
+    def test_counts_accesses(self):
+        """Test estimates follow increments and start at zero."""
+        sketch = FrequencySketch(capacity=100)
+        for _ in range(3):
+            sketch.increment("a")
+        sketch.increment("b")
+        
+        assert sketch.estimate("a") == 3
+        assert sketch.estimate("b") == 1
+        assert sketch.estimate("never-seen") == 0
+    
+    def test_counters_saturate(self):
+        """Test counters stop at the 4-bit maximum."""
+        sketch = FrequencySketch(capacity=100)
+        for _ in range(40):
+            sketch.increment("hot")
+        
+        assert sketch.estimate("hot") == FrequencySketch._MAX_COUNT
+    
+    def test_aging_halves_counters(self):
+        """Test every counter is halved after sample_size additions."""
+        sketch = FrequencySketch(capacity=100)
+        for _ in range(8):
+            sketch.increment("a")
+        assert sketch.estimate("a") == 8
+        
+        # Fill up to the sample size with other keys to trigger the reset;
+        # few keys in wide rows, so none shares all of a's counters whatever
+        # the hash seed
+        for i in range(sketch._sample_size - 8):
+            sketch.increment(f"other{i % 5}")
+        
+        assert sketch.estimate("a") == 4
+        assert sketch._additions == sketch._sample_size // 2
+
+
+class TestAdaptiveCache:
+    """Tests for AdaptiveCache admission and eviction."""
+    
+    def test_get_set(self):
+        """Test hits, misses and hit rate."""
+        cache = AdaptiveCache(max_size=2)
+        cache.set("a", 1)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.hit_rate == 0.5
+    
+    def test_admitted_newcomer_replaces_clock_victim(self):
+        """Test the unreferenced entry admission compared against is evicted."""
+        cache = AdaptiveCache(max_size=3)
+        for key in "abc":
+            cache.set(key, key)
+        cache.get("a")
+        cache.get("b")
+        
+        cache.set("d", "d")
+        
+        assert sorted(cache.cache) == ["a", "b", "d"]
+        assert cache.stats['rejected'] == 0
+        # The sweep spent a and b's second chances
+        assert not cache.referenced & {"a", "b"}
+    
+    def test_clock_hand_resumes_after_last_victim(self):
+        """Test a sweep starts after the previous victim, not at the oldest entry."""
+        cache = AdaptiveCache(max_size=4)
+        for key in "abcd":
+            cache.set(key, key)
+        cache.get("a")
+        cache.get("b")
+        cache.set("e", "e")
+        assert sorted(cache.cache) == ["a", "b", "d", "e"]
+        
+        cache.get("a")
+        cache.get("b")
+        cache.set("f", "f")
+        
+        assert sorted(cache.cache) == ["a", "b", "e", "f"]
+        # The hand started past a and b, so their new bits are untouched
+        assert {"a", "b"} <= cache.referenced
+    
+    def test_rare_newcomer_is_rejected(self):
+        """Test a newcomer requested less often than the victim is not admitted."""
+        cache = AdaptiveCache(max_size=2)
+        cache.set("a", "a")
+        cache.set("b", "b")
+        for _ in range(3):
+            cache.get("a")
+            cache.get("b")
+        
+        cache.set("c", "c")
+        
+        assert sorted(cache.cache) == ["a", "b"]
+        assert cache.stats['rejected'] == 1
+        assert len(cache._free) == 0
+    
+    def test_frequent_newcomer_is_admitted(self):
+        """Test repeated requests for a key earn it admission."""
+        cache = AdaptiveCache(max_size=2)
+        cache.set("a", "a")
+        cache.set("b", "b")
+        for _ in range(3):
+            cache.get("c")
+        
+        cache.set("c", "c")
+        
+        assert "c" in cache.cache
+        assert len(cache.cache) == 2
+    
+    def test_update_does_not_evict(self):
+        """Test overwriting an existing key keeps every entry."""
+        cache = AdaptiveCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)
+        
+        assert cache.cache == {"b": 2, "a": 3}
+    
+    def test_expired_entries(self, monkeypatch):
+        """Test expired entries miss and are swept by purge_expired."""
+        now = [1000.0]
+        monkeypatch.setattr(performance_optimizer.time, "monotonic", lambda: now[0])
+        cache = AdaptiveCache(max_size=4, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        now[0] += 5
+        cache.set("c", 3)
+        now[0] += 6
+        
+        assert cache.get("a") is None
+        assert cache.purge_expired() == 1
+        assert list(cache.cache) == ["c"]
+        assert len(cache._free) == 3
+
+
+class TestParallelExecutor:
+    """Tests for ParallelExecutor.map_async failure handling."""
+    
+    @pytest.fixture
+    def executor(self, monkeypatch):
+        executor = ParallelExecutor(max_workers=2)
+        monkeypatch.setattr(executor, "_check_memory", lambda: True)
+        yield executor
+        executor.shutdown()
+    
+    def _run(self, coro):
+        unretrieved = []
+        
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.set_exception_handler(lambda loop, context: unretrieved.append(context))
+            return await coro()
+        
+        try:
+            return asyncio.run(main())
+        finally:
+            assert unretrieved == []
+    
+    def test_results_in_input_order(self, executor):
+        """Test results follow the input order."""
+        async def double(item):
+            await asyncio.sleep(0.01 * (3 - item))
+            return item * 2
+        
+        assert self._run(lambda: executor.map_async(double, [1, 2, 3])) == [2, 4, 6]
+    
+    def test_first_failure_cancels_the_rest(self, executor):
+        """Test a failure cancels queued work and every error is retrieved."""
+        started = []
+        
+        async def work(item):
+            started.append(item)
+            await asyncio.sleep(0)
+            raise ValueError(item)
+        
+        with pytest.raises(ValueError, match="0"):
+            self._run(lambda: executor.map_async(work, list(range(6))))
+        
+        assert len(started) < 6
+    
+    def test_caller_cancellation_cancels_work(self, executor):
+        """Test cancelling map_async cancels the tasks it started."""
+        finished = []
+        
+        async def work(item):
+            await asyncio.sleep(1)
+            finished.append(item)
+        
+        async def cancel_map():
+            task = asyncio.ensure_future(executor.map_async(work, [1, 2]))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0)
+            return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        
+        assert self._run(cancel_map) == []
+        assert finished == []
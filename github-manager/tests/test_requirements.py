@@ -0,0 +1,49 @@
+"""
+Tests for requirements.txt parsing.
+"""
+
+import pytest
+
+from src.utils.requirements import requirement_name, requirement_names
+
+
+class TestRequirementName:
+    """Tests for requirement_name."""
+    
+    @pytest.mark.parametrize("line, name", [
+        ("requests", "requests"),
+        ("requests==2.31.0", "requests"),
+        ("aiohttp>=3.9.1", "aiohttp"),
+        ("numpy<2,>=1.24", "numpy"),
+        ("black~=23.11", "black"),
+        ("flask!=2.0.0", "flask"),
+        ("uvicorn[standard]>=0.24.0", "uvicorn"),
+        ("pywin32; sys_platform == 'win32'", "pywin32"),
+        ("rich>=13.7.0  # Better terminal output", "rich"),
+        ("  xxhash  ", "xxhash"),
+        ("pkg @ https://example.com/pkg.whl", "pkg"),
+        ("pkg@https://example.com/pkg.whl", "pkg"),
+    ])
+    def test_names(self, line, name):
+        """Test the project name is split from specifiers, extras and markers."""
+        assert requirement_name(line) == name
+    
+    @pytest.mark.parametrize("line", [
+        "",
+        "   ",
+        "# Core dependencies",
+        "-r dev.txt",
+        "-e .",
+        "--hash=sha256:abc",
+        "https://example.com/pkg.whl",
+        "==1.0",
+    ])
+    def test_not_requirements(self, line):
+        """Test comments, options and bare URLs have no name."""
+        assert requirement_name(line) is None
+    
+    def test_requirement_names(self):
+        """Test non-requirement lines are skipped."""
+        lines = ["# Core", "PyGithub>=2.1.1", "", "-r base.txt", "click"]
+        
+        assert requirement_names(lines) == ["PyGithub", "click"]
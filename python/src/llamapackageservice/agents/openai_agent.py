@@ -9,11 +9,59 @@ from datetime import datetime
 import logging
 import uuid
 
+import httpx
+
+try:
+    import h2  # noqa: F401  enables HTTP/2 in httpx
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
 from ..error import ProcessorError, LLMError
 from .analysis import AnalysisRequest, AnalysisResult, AnalysisType
 
 logger = logging.getLogger(__name__)
 
+# Sent unchanged with every request, so it is built once and shared
+_SYSTEM_PROMPT = """You are an expert software engineer and technical writer.
+Your task is to analyze code repositories and generate high-quality documentation,
+code reviews, and insights.
+
+When analyzing code:
+1. Be thorough but concise
+2. Provide actionable recommendations
+3. Use clear, professional language
+4. Include code examples where appropriate
+5. Consider best practices and industry standards
+
+Format your responses in Markdown for readability."""
+
+_TYPE_PROMPTS: Dict[AnalysisType, str] = {
+    AnalysisType.DOCUMENTATION: (
+        "Generate comprehensive documentation for this repository. "
+        "Include an overview, installation instructions, usage examples, "
+        "and API documentation."
+    ),
+    AnalysisType.CODE_REVIEW: (
+        "Perform a code review of this repository. "
+        "Identify potential issues, suggest improvements, "
+        "and highlight good practices."
+    ),
+    AnalysisType.API_DOCUMENTATION: (
+        "Generate detailed API documentation for this repository. "
+        "Document all public functions, classes, and methods."
+    ),
+    AnalysisType.SECURITY_AUDIT: (
+        "Perform a security audit of this repository. "
+        "Identify potential vulnerabilities, insecure practices, "
+        "and recommend security improvements."
+    ),
+    AnalysisType.EXAMPLES: (
+        "Generate usage examples for this repository. "
+        "Create clear, practical examples that demonstrate key features."
+    ),
+}
+
 
 @dataclass
 class AgentConfig:
@@ -82,11 +130,26 @@ class OpenAIAgent:
         if self._client is None:
             try:
                 from openai import AsyncOpenAI
-                self._client = AsyncOpenAI(api_key=self.config.api_key)
             except ImportError:
                 raise LLMError("OpenAI package not installed. Run: pip install openai")
+            # One pooled connection is kept open across analyses so each
+            # request doesn't pay for a fresh TLS handshake
+            self._client = AsyncOpenAI(
+                api_key=self.config.api_key,
+                http_client=httpx.AsyncClient(
+                    http2=HAS_H2,
+                    limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                ),
+            )
         return self._client
     
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+    
     async def analyze_repository(self, request: AnalysisRequest) -> AnalysisResult:
         """
         Analyze a repository using OpenAI.
@@ -144,34 +207,11 @@ class OpenAIAgent:
         """Build the analysis prompt based on request type."""
         base = f"Analyze the repository: {request.repository}\n\n"
         
-        type_prompts = {
-            AnalysisType.DOCUMENTATION: (
-                "Generate comprehensive documentation for this repository. "
-                "Include an overview, installation instructions, usage examples, "
-                "and API documentation."
-            ),
-            AnalysisType.CODE_REVIEW: (
-                "Perform a code review of this repository. "
-                "Identify potential issues, suggest improvements, "
-                "and highlight good practices."
-            ),
-            AnalysisType.API_DOCUMENTATION: (
-                "Generate detailed API documentation for this repository. "
-                "Document all public functions, classes, and methods."
-            ),
-            AnalysisType.SECURITY_AUDIT: (
-                "Perform a security audit of this repository. "
-                "Identify potential vulnerabilities, insecure practices, "
-                "and recommend security improvements."
-            ),
-            AnalysisType.EXAMPLES: (
-                "Generate usage examples for this repository. "
-                "Create clear, practical examples that demonstrate key features."
-            ),
-            AnalysisType.CUSTOM: request.context or "Analyze this repository.",
-        }
-        
-        prompt = base + type_prompts.get(request.analysis_type, "Analyze this repository.")
+        if request.analysis_type == AnalysisType.CUSTOM:
+            instructions = request.context or "Analyze this repository."
+        else:
+            instructions = _TYPE_PROMPTS.get(request.analysis_type, "Analyze this repository.")
+        prompt = base + instructions
         
         if request.context and request.analysis_type != AnalysisType.CUSTOM:
             prompt += f"\n\nAdditional context: {request.context}"
@@ -181,15 +221,4 @@ class OpenAIAgent:
 
 def _get_default_system_prompt() -> str:
     """Get the default system prompt for code analysis."""
-    return """You are an expert software engineer and technical writer.
-Your task is to analyze code repositories and generate high-quality documentation,
-code reviews, and insights.
-
-When analyzing code:
-1. Be thorough but concise
-2. Provide actionable recommendations
-3. Use clear, professional language
-4. Include code examples where appropriate
-5. Consider best practices and industry standards
-
-Format your responses in Markdown for readability."""
+    return _SYSTEM_PROMPT
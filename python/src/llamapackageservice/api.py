@@ -9,6 +9,7 @@ from typing import Optional, Dict, List
 from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
+import os
 import uuid
 import asyncio
 import logging
@@ -91,7 +92,8 @@ class JobManager:
         self._config = config
         self._start_time = datetime.utcnow()
         self._completed_count = 0
-        self._lock = asyncio.Lock()
+        # No lock: every access to _jobs happens on the event loop thread
+        # without an await in between, so each update is already atomic.
     
     @property
     def output_dir(self) -> Path:
@@ -126,8 +128,7 @@ class JobManager:
             current_operation="Validating URL",
         )
         
-        async with self._lock:
-            self._jobs[job_id] = job_status
+        self._jobs[job_id] = job_status
         
         # Start processing in background
         asyncio.create_task(self._process_job(job_id, normalized_url, output_dir))
@@ -142,15 +143,13 @@ class JobManager:
     
     async def get_job_status(self, job_id: str) -> JobStatus:
         """Get the status of a job."""
-        async with self._lock:
-            if job_id not in self._jobs:
-                raise ProcessorError(f"Job not found: {job_id}")
-            return self._jobs[job_id]
+        if job_id not in self._jobs:
+            raise ProcessorError(f"Job not found: {job_id}")
+        return self._jobs[job_id]
     
     async def list_jobs(self) -> List[JobStatus]:
         """List all jobs."""
-        async with self._lock:
-            return list(self._jobs.values())
+        return list(self._jobs.values())
     
     async def _process_job(
         self,
@@ -161,29 +160,28 @@ class JobManager:
         """Process a job in the background."""
         try:
             # Update status to processing
-            async with self._lock:
-                self._jobs[job_id].status = JobStatusType.PROCESSING
-                self._jobs[job_id].current_operation = "Starting processing"
-                self._jobs[job_id].updated_at = datetime.utcnow()
+            job = self._jobs[job_id]
+            job.status = JobStatusType.PROCESSING
+            job.current_operation = "Starting processing"
+            job.updated_at = datetime.utcnow()
             
             # Create processor and process
             processor = ProcessorFactory.create_processor(url)
             await processor.process(url, output_dir, self._config)
             
             # Update status to completed
-            async with self._lock:
-                self._jobs[job_id].status = JobStatusType.COMPLETED
-                self._jobs[job_id].progress = 100
-                self._jobs[job_id].current_operation = "Completed"
-                self._jobs[job_id].updated_at = datetime.utcnow()
-                self._completed_count += 1
+            job.status = JobStatusType.COMPLETED
+            job.progress = 100
+            job.current_operation = "Completed"
+            job.updated_at = datetime.utcnow()
+            self._completed_count += 1
                 
         except Exception as e:
             logger.error(f"Job {job_id} failed: {e}")
-            async with self._lock:
-                self._jobs[job_id].status = JobStatusType.FAILED
-                self._jobs[job_id].error_message = str(e)
-                self._jobs[job_id].updated_at = datetime.utcnow()
+            job = self._jobs[job_id]
+            job.status = JobStatusType.FAILED
+            job.error_message = str(e)
+            job.updated_at = datetime.utcnow()
     
     def get_health(self) -> HealthResponse:
         """Get health status."""
@@ -222,14 +220,19 @@ def create_app(config: Optional[Config] = None):
         version="0.1.0",
     )
     
-    # Add CORS middleware
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    # Add CORS middleware. ALLOWED_ORIGINS is a comma-separated list; unset
+    # or empty means same-origin only, so no CORS headers are sent. A
+    # wildcard never carries credentials.
+    allowed_origins = os.getenv("ALLOWED_ORIGINS", "")
+    origins = [o.strip() for o in allowed_origins.split(",") if o.strip()]
+    if origins:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=origins,
+            allow_credentials="*" not in origins,
+            allow_methods=["GET", "POST"],
+            allow_headers=["authorization", "content-type"],
+        )
     
     # Create job manager
     job_manager = JobManager(config)
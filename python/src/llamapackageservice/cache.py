@@ -7,10 +7,12 @@ downloaded content and processed results.
 
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import TypeVar, Generic, Optional, Dict, Any
+from typing import TypeVar, Generic, Optional, Dict, Any, Set
+import asyncio
 import hashlib
 import json
-import asyncio
+import os
+import time
 from dataclasses import dataclass, field
 
 import aiofiles
@@ -18,6 +20,8 @@ import aiofiles.os
 
 from .error import CacheError
 
+_monotonic = time.monotonic
+
 
 @dataclass
 class CacheEntry:
@@ -53,11 +57,52 @@ class CacheEntry:
 
 
 class FileCache:
-    """A file-based cache for storing downloaded or generated content."""
+    """
+    A file-based cache for storing downloaded or generated content.
+    
+    The names of the metadata files on disk are listed and kept in memory,
+    so a miss is usually answered without a filesystem round trip. A miss on
+    a listing older than index_ttl lists the directory again, so entries
+    written by another process or instance are found within index_ttl.
+    """
     
-    def __init__(self, cache_dir: Path, default_ttl: timedelta = timedelta(hours=24)):
+    def __init__(
+        self,
+        cache_dir: Path,
+        default_ttl: timedelta = timedelta(hours=24),
+        index_ttl: timedelta = timedelta(seconds=5),
+    ):
         self.cache_dir = Path(cache_dir)
         self.default_ttl = default_ttl
+        self.index_ttl = index_ttl
+        self._known: Optional[Set[str]] = None
+        self._known_at = 0.0
+    
+    async def _known_entries(self) -> Set[str]:
+        """Names of the metadata files present, listed on first use."""
+        if self._known is None:
+            await self._refresh_entries()
+        return self._known
+    
+    async def _refresh_entries(self) -> Set[str]:
+        self._known_at = _monotonic()
+        self._known = await asyncio.to_thread(self._scan_entries)
+        return self._known
+    
+    async def _is_known(self, name: str) -> bool:
+        if name in await self._known_entries():
+            return True
+        # The listing may predate a write by another process or instance
+        if _monotonic() - self._known_at < self.index_ttl.total_seconds():
+            return False
+        return name in await self._refresh_entries()
+    
+    def _scan_entries(self) -> Set[str]:
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                return {entry.name for entry in entries if entry.name.endswith(".meta")}
+        except FileNotFoundError:
+            return set()
     
     def _get_safe_key(self, key: str) -> str:
         """Create a safe filename from the key."""
@@ -77,6 +122,11 @@ class FileCache:
         """Get the metadata file path for a key."""
         return self._get_path(key).with_suffix(".meta")
     
+    def _get_paths(self, key: str) -> tuple[Path, Path]:
+        """Get the content and metadata paths, deriving the safe key once."""
+        path = self._get_path(key)
+        return path, path.with_suffix(".meta")
+    
     async def get(self, key: str) -> Optional[CacheEntry]:
         """
         Retrieve a cached entry by its key if it exists and is not expired.
@@ -87,8 +137,10 @@ class FileCache:
         Returns:
             The cached entry if found and not expired, None otherwise
         """
-        meta_path = self._get_meta_path(key)
+        path, meta_path = self._get_paths(key)
         
+        if not await self._is_known(meta_path.name):
+            return None
         if not await aiofiles.os.path.exists(meta_path):
             return None
         
@@ -101,7 +153,7 @@ class FileCache:
             # Check if entry is expired
             if entry.is_expired():
                 # Entry is expired, remove it
-                await self.remove(key)
+                await self._remove_paths(path, meta_path)
                 return None
             
             return entry
@@ -125,8 +177,7 @@ class FileCache:
         Returns:
             Path to the cached file
         """
-        path = self._get_path(key)
-        meta_path = self._get_meta_path(key)
+        path, meta_path = self._get_paths(key)
         
         # Ensure cache directory exists
         if path.parent:
@@ -148,14 +199,18 @@ class FileCache:
             async with aiofiles.open(meta_path, 'w') as f:
                 await f.write(json.dumps(entry.to_dict()))
             
+            (await self._known_entries()).add(meta_path.name)
             return path
         except Exception as e:
             raise CacheError(f"Failed to write cache entry: {e}", source=e)
     
     async def remove(self, key: str) -> bool:
         """Remove an entry from the cache."""
-        path = self._get_path(key)
-        meta_path = self._get_meta_path(key)
+        return await self._remove_paths(*self._get_paths(key))
+    
+    async def _remove_paths(self, path: Path, meta_path: Path) -> bool:
+        if self._known is not None:
+            self._known.discard(meta_path.name)
         removed = False
         
         try:
@@ -173,6 +228,7 @@ class FileCache:
     async def clear(self) -> int:
         """Clear all entries from the cache. Returns number of entries removed."""
         count = 0
+        self._known = None
         try:
             if await aiofiles.os.path.exists(self.cache_dir):
                 for item in self.cache_dir.iterdir():
@@ -187,12 +243,19 @@ T = TypeVar('T')
 
 
 class Cache(Generic[T]):
-    """A generic in-memory cache for any type."""
+    """
+    A generic in-memory cache for any type.
+    
+    Not guarded by a lock: none of the operations await, so on a single
+    event loop each one runs to completion without interleaving.
+    """
     
     def __init__(self, ttl: timedelta = timedelta(hours=1)):
-        self._store: Dict[str, tuple[T, datetime]] = {}
+        # Values are stored with a monotonic-clock expiry deadline, so hits
+        # compare two floats instead of doing datetime arithmetic
+        self._store: Dict[str, tuple[T, float]] = {}
         self._ttl = ttl
-        self._lock = asyncio.Lock()
+        self._ttl_seconds = ttl.total_seconds()
     
     async def get(self, key: str) -> Optional[T]:
         """
@@ -204,18 +267,18 @@ class Cache(Generic[T]):
         Returns:
             The cached value if found and not expired, None otherwise
         """
-        async with self._lock:
-            if key not in self._store:
-                return None
-            
-            value, timestamp = self._store[key]
-            
-            # Check if expired
-            if datetime.now() - timestamp > self._ttl:
-                del self._store[key]
-                return None
-            
-            return value
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        
+        value, expires_at = entry
+        
+        # Check if expired
+        if _monotonic() > expires_at:
+            self._store.pop(key, None)
+            return None
+        
+        return value
     
     async def set(self, key: str, value: T) -> None:
         """
@@ -225,8 +288,7 @@ class Cache(Generic[T]):
             key: The cache key
             value: The value to store
         """
-        async with self._lock:
-            self._store[key] = (value, datetime.now())
+        self._store[key] = (value, _monotonic() + self._ttl_seconds)
     
     async def remove(self, key: str) -> bool:
         """
@@ -238,16 +300,14 @@ class Cache(Generic[T]):
         Returns:
             True if the entry was removed, False if it didn't exist
         """
-        async with self._lock:
-            if key in self._store:
-                del self._store[key]
-                return True
-            return False
+        if key in self._store:
+            del self._store[key]
+            return True
+        return False
     
     async def clear(self) -> None:
         """Clear all entries from the cache."""
-        async with self._lock:
-            self._store.clear()
+        self._store.clear()
     
     async def cleanup_expired(self) -> int:
         """
@@ -256,15 +316,14 @@ class Cache(Generic[T]):
         Returns:
             Number of entries removed
         """
-        async with self._lock:
-            now = datetime.now()
-            expired_keys = [
-                key for key, (_, timestamp) in self._store.items()
-                if now - timestamp > self._ttl
-            ]
-            for key in expired_keys:
-                del self._store[key]
-            return len(expired_keys)
+        now = _monotonic()
+        expired_keys = [
+            key for key, (_, expires_at) in self._store.items()
+            if now > expires_at
+        ]
+        for key in expired_keys:
+            del self._store[key]
+        return len(expired_keys)
     
     def __len__(self) -> int:
         """Return the number of entries in the cache."""
@@ -48,30 +48,22 @@ class ParallelProcessor:
         async def execute_with_semaphore(
             task: Callable[[], Awaitable[T]],
             index: int,
-        ) -> tuple[int, T | ProcessorError]:
+        ) -> T | ProcessorError:
             async with self._semaphore:
                 try:
-                    result = await task()
-                    return (index, result)
+                    return await task()
                 except ProcessorError as e:
-                    return (index, e)
+                    return e
                 except Exception as e:
                     logger.error(f"Task {index} failed: {e}")
-                    return (index, ProcessorError(str(e)))
+                    return ProcessorError(str(e))
         
-        # Create tasks with their indices
-        indexed_tasks = [
+        # gather() already returns results in submission order, so no
+        # index tagging or re-sorting is needed
+        return await asyncio.gather(*(
             execute_with_semaphore(task, i)
             for i, task in enumerate(tasks)
-        ]
-        
-        # Execute all tasks concurrently
-        completed = await asyncio.gather(*indexed_tasks)
-        
-        # Sort results by original index
-        sorted_results = sorted(completed, key=lambda x: x[0])
-        
-        return [result for _, result in sorted_results]
+        ))
     
     async def map(
         self,
@@ -97,6 +97,79 @@ def format_file_size(size_bytes: int) -> str:
         return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
 
 
+EXTENSION_MAP = {
+    'py': 'Python',
+    'rs': 'Rust',
+    'go': 'Go',
+    'js': 'JavaScript',
+    'ts': 'TypeScript',
+    'jsx': 'JavaScript (React)',
+    'tsx': 'TypeScript (React)',
+    'java': 'Java',
+    'kt': 'Kotlin',
+    'scala': 'Scala',
+    'rb': 'Ruby',
+    'php': 'PHP',
+    'c': 'C',
+    'cpp': 'C++',
+    'cc': 'C++',
+    'cxx': 'C++',
+    'h': 'C/C++ Header',
+    'hpp': 'C++ Header',
+    'cs': 'C#',
+    'fs': 'F#',
+    'swift': 'Swift',
+    'm': 'Objective-C',
+    'mm': 'Objective-C++',
+    'sh': 'Shell',
+    'bash': 'Bash',
+    'zsh': 'Zsh',
+    'ps1': 'PowerShell',
+    'sql': 'SQL',
+    'html': 'HTML',
+    'css': 'CSS',
+    'scss': 'SCSS',
+    'sass': 'Sass',
+    'less': 'Less',
+    'json': 'JSON',
+    'yaml': 'YAML',
+    'yml': 'YAML',
+    'toml': 'TOML',
+    'xml': 'XML',
+    'md': 'Markdown',
+    'rst': 'reStructuredText',
+    'r': 'R',
+    'lua': 'Lua',
+    'dart': 'Dart',
+    'hs': 'Haskell',
+    'elm': 'Elm',
+    'ex': 'Elixir',
+    'exs': 'Elixir',
+    'erl': 'Erlang',
+    'clj': 'Clojure',
+    'cljs': 'ClojureScript',
+    'vue': 'Vue',
+    'svelte': 'Svelte',
+}
+
+
+def file_extension(name: str) -> str:
+    """
+    Get the lowercased extension of a file name.
+    
+    Cheaper than building a Path for its suffix; names that start with a
+    dot and have no other dot (".gitignore") have no extension.
+    
+    Args:
+        name: File name (not a full path)
+        
+    Returns:
+        Extension including the leading dot, or an empty string
+    """
+    dot = name.rfind('.')
+    return name[dot:].lower() if dot > 0 else ''
+
+
 def detect_language_from_extension(ext: str) -> str:
     """
     Detect programming language from file extension.
@@ -108,62 +181,6 @@ def detect_language_from_extension(ext: str) -> str:
         Language name
     """
     ext = ext.lower().lstrip('.')
-    
-    EXTENSION_MAP = {
-        'py': 'Python',
-        'rs': 'Rust',
-        'go': 'Go',
-        'js': 'JavaScript',
-        'ts': 'TypeScript',
-        'jsx': 'JavaScript (React)',
-        'tsx': 'TypeScript (React)',
-        'java': 'Java',
-        'kt': 'Kotlin',
-        'scala': 'Scala',
-        'rb': 'Ruby',
-        'php': 'PHP',
-        'c': 'C',
-        'cpp': 'C++',
-        'cc': 'C++',
-        'cxx': 'C++',
-        'h': 'C/C++ Header',
-        'hpp': 'C++ Header',
-        'cs': 'C#',
-        'fs': 'F#',
-        'swift': 'Swift',
-        'm': 'Objective-C',
-        'mm': 'Objective-C++',
-        'sh': 'Shell',
-        'bash': 'Bash',
-        'zsh': 'Zsh',
-        'ps1': 'PowerShell',
-        'sql': 'SQL',
-        'html': 'HTML',
-        'css': 'CSS',
-        'scss': 'SCSS',
-        'sass': 'Sass',
-        'less': 'Less',
-        'json': 'JSON',
-        'yaml': 'YAML',
-        'yml': 'YAML',
-        'toml': 'TOML',
-        'xml': 'XML',
-        'md': 'Markdown',
-        'rst': 'reStructuredText',
-        'r': 'R',
-        'lua': 'Lua',
-        'dart': 'Dart',
-        'hs': 'Haskell',
-        'elm': 'Elm',
-        'ex': 'Elixir',
-        'exs': 'Elixir',
-        'erl': 'Erlang',
-        'clj': 'Clojure',
-        'cljs': 'ClojureScript',
-        'vue': 'Vue',
-        'svelte': 'Svelte',
-    }
-    
     return EXTENSION_MAP.get(ext, 'Unknown')
 
 
@@ -4,6 +4,7 @@ GitHub repository processor.
 Handles processing of GitHub repositories and organizations.
 """
 
+import asyncio
 import os
 import re
 import zipfile
@@ -18,16 +19,27 @@ import httpx
 import aiofiles
 import aiofiles.os
 
+try:
+    import h2  # noqa: F401  enables HTTP/2 in httpx
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
 from ..config import Config
 from ..error import ProcessorError, GitHubApiError, ValidationError, HttpError
 from .base import PackageProcessor
-from .common import sanitize_filename, get_timestamp, save_output_file, detect_language_from_extension
+from .common import (
+    sanitize_filename, get_timestamp, save_output_file, detect_language_from_extension, file_extension
+)
 
 logger = logging.getLogger(__name__)
 
 GITHUB_API_BASE = "https://api.github.com"
 GITHUB_BASE = "https://github.com"
 
+# Upper bound on API responses kept for conditional revalidation
+CONDITIONAL_CACHE_SIZE = 256
+
 # File extensions to process
 CODE_EXTENSIONS = {
     '.rs', '.go', '.c', '.cpp', '.h', '.hpp',
@@ -79,6 +91,8 @@ class GitHubProcessor(PackageProcessor):
     def __init__(self):
         self.client: Optional[httpx.AsyncClient] = None
         self._token: Optional[str] = None
+        # Validators of earlier API responses, keyed by full request URL
+        self._conditional_cache: Dict[str, httpx.Response] = {}
     
     def _get_headers(self) -> Dict[str, str]:
         """Get HTTP headers including auth token if available."""
@@ -94,12 +108,50 @@ class GitHubProcessor(PackageProcessor):
         """Ensure the HTTP client is initialized."""
         if self.client is None:
             self._token = config.github_token or os.getenv("GITHUB_TOKEN")
+            # Requests to the API are multiplexed over one connection when
+            # HTTP/2 support is installed; otherwise they share a keep-alive pool
             self.client = httpx.AsyncClient(
                 timeout=30.0,
                 headers=self._get_headers(),
+                http2=HAS_H2,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
             )
         return self.client
     
+    async def _conditional_get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """
+        GET an API resource, revalidating any cached copy with its ETag.
+        
+        GitHub answers an unchanged resource with 304 Not Modified, which
+        does not count against the rate limit; the cached response is
+        returned in that case.
+        """
+        key = str(httpx.URL(url, params=params))
+        cached = self._conditional_cache.get(key)
+        headers = {}
+        if cached is not None:
+            if "etag" in cached.headers:
+                headers["If-None-Match"] = cached.headers["etag"]
+            if "last-modified" in cached.headers:
+                headers["If-Modified-Since"] = cached.headers["last-modified"]
+        
+        response = await client.get(url, params=params, headers=headers)
+        
+        if response.status_code == 304 and cached is not None:
+            return cached
+        if response.is_success and (
+            "etag" in response.headers or "last-modified" in response.headers
+        ):
+            if len(self._conditional_cache) >= CONDITIONAL_CACHE_SIZE:
+                self._conditional_cache.pop(next(iter(self._conditional_cache)))
+            self._conditional_cache[key] = response
+        return response
+    
     def name(self) -> str:
         return "GitHub Repository"
     
@@ -227,8 +279,10 @@ class GitHubProcessor(PackageProcessor):
         logger.info(f"Processing organization: {org}")
         
         # Fetch organization info and repositories
-        org_info = await self._fetch_org_info(client, org)
-        repos = await self._fetch_org_repos(client, org)
+        org_info, repos = await asyncio.gather(
+            self._fetch_org_info(client, org),
+            self._fetch_org_repos(client, org),
+        )
         
         # Create output directory
         orgs_dir = output_dir / "github_orgs" / sanitize_filename(org)
@@ -265,7 +319,7 @@ class GitHubProcessor(PackageProcessor):
         """Fetch repository information from GitHub API."""
         url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
         
-        response = await client.get(url)
+        response = await self._conditional_get(client, url)
         
         if response.status_code == 404:
             raise ValidationError(f"Repository not found: {owner}/{repo}")
@@ -294,7 +348,7 @@ class GitHubProcessor(PackageProcessor):
         """Fetch organization information from GitHub API."""
         url = f"{GITHUB_API_BASE}/orgs/{org}"
         
-        response = await client.get(url)
+        response = await self._conditional_get(client, url)
         
         if response.status_code == 404:
             raise ValidationError(f"Organization not found: {org}")
@@ -323,7 +377,7 @@ class GitHubProcessor(PackageProcessor):
             url = f"{GITHUB_API_BASE}/orgs/{org}/repos"
             params = {'page': page, 'per_page': per_page, 'type': 'public'}
             
-            response = await client.get(url, params=params)
+            response = await self._conditional_get(client, url, params)
             
             if not response.is_success:
                 break
@@ -459,19 +513,27 @@ class GitHubProcessor(PackageProcessor):
     
     async def _analyze_languages(self, root: Path) -> Dict[str, int]:
         """Analyze programming languages used in the repository."""
-        stats: Dict[str, int] = {}
+        ext_counts: Dict[str, int] = {}
         
+        # Cheapest checks first: most paths are rejected on their extension
+        # without a stat() call
         for path in root.rglob('*'):
+            ext = file_extension(path.name)
+            if ext not in CODE_EXTENSIONS:
+                continue
+            
+            # Skip ignored directories
+            if not SKIP_DIRS.isdisjoint(path.parts):
+                continue
+            
             if path.is_file():
-                # Skip ignored directories
-                if any(skip in path.parts for skip in SKIP_DIRS):
-                    continue
-                
-                ext = path.suffix.lower()
-                if ext in CODE_EXTENSIONS:
-                    lang = detect_language_from_extension(ext)
-                    stats[lang] = stats.get(lang, 0) + 1
+                ext_counts[ext] = ext_counts.get(ext, 0) + 1
         
+        # Map each distinct extension to its language once
+        stats: Dict[str, int] = {}
+        for ext, count in ext_counts.items():
+            lang = detect_language_from_extension(ext)
+            stats[lang] = stats.get(lang, 0) + count
         return stats
     
     async def _collect_source_code(self, root: Path, max_files: int = 100) -> str:
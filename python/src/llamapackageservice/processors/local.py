@@ -16,7 +16,9 @@ from ..config import Config
 from ..error import ProcessorError, ValidationError
 from ..utils.path import is_local_path, is_code_file, should_ignore_path
 from .base import PackageProcessor
-from .common import sanitize_filename, get_timestamp, save_output_file, detect_language_from_extension
+from .common import (
+    sanitize_filename, get_timestamp, save_output_file, detect_language_from_extension, file_extension
+)
 
 logger = logging.getLogger(__name__)
 
@@ -184,9 +186,11 @@ class LocalProcessor(PackageProcessor):
             'languages': {},
         }
         
+        ext_counts: Dict[str, int] = {}
+        
         for path in root.rglob('*'):
             # Skip ignored directories
-            if any(skip in path.parts for skip in SKIP_DIRS):
+            if not SKIP_DIRS.isdisjoint(path.parts):
                 continue
             
             if path.is_file():
@@ -196,14 +200,19 @@ class LocalProcessor(PackageProcessor):
                 except Exception:
                     pass
                 
-                ext = path.suffix.lower()
+                ext = file_extension(path.name)
                 if ext:
-                    lang = detect_language_from_extension(ext)
-                    if lang != 'Unknown':
-                        stats['languages'][lang] = stats['languages'].get(lang, 0) + 1
+                    ext_counts[ext] = ext_counts.get(ext, 0) + 1
             elif path.is_dir():
                 stats['dir_count'] += 1
         
+        # Map each distinct extension to its language once
+        languages = stats['languages']
+        for ext, count in ext_counts.items():
+            lang = detect_language_from_extension(ext)
+            if lang != 'Unknown':
+                languages[lang] = languages.get(lang, 0) + count
+        
         return stats
     
     async def _find_readme(self, root: Path) -> Optional[str]:
@@ -7,7 +7,9 @@ from pathlib import Path
 import tempfile
 import time
 import asyncio
+from datetime import timedelta
 
+from llamapackageservice import cache as cache_module
 from llamapackageservice.cache import Cache, FileCache, CacheEntry
 
 
@@ -161,5 +163,149 @@ class TestFileCache:
         assert result == "value1"
 
 
+class TestCacheWithoutLock:
+    """Tests for the lock-free in-memory Cache API."""
+    
+    @pytest.mark.asyncio
+    async def test_get_set_remove(self):
+        """Test get/set/remove round trip."""
+        cache: Cache[str] = Cache(ttl=timedelta(minutes=1))
+        
+        await cache.set("key1", "value1")
+        assert await cache.get("key1") == "value1"
+        assert len(cache) == 1
+        assert await cache.remove("key1") is True
+        assert await cache.remove("key1") is False
+        assert await cache.get("key1") is None
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_operations(self):
+        """Test that interleaved tasks see consistent entries."""
+        cache: Cache[int] = Cache(ttl=timedelta(minutes=1))
+        
+        await asyncio.gather(*(cache.set(f"key{i}", i) for i in range(100)))
+        values = await asyncio.gather(*(cache.get(f"key{i}") for i in range(100)))
+        
+        assert values == list(range(100))
+        assert len(cache) == 100
+
+
+class TestCacheMonotonicExpiry:
+    """Tests for expiry against the monotonic clock."""
+    
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Replace the cache's monotonic clock with a settable one."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module, "_monotonic", lambda: now[0])
+        return now
+    
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(self, clock):
+        """Test an entry is served until its TTL passes, then dropped."""
+        cache: Cache[str] = Cache(ttl=timedelta(seconds=10))
+        await cache.set("key1", "value1")
+        
+        clock[0] += 10
+        assert await cache.get("key1") == "value1"
+        clock[0] += 0.001
+        assert await cache.get("key1") is None
+        assert len(cache) == 0
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_expired(self, clock):
+        """Test cleanup_expired removes only expired entries."""
+        cache: Cache[str] = Cache(ttl=timedelta(seconds=10))
+        await cache.set("old", "value")
+        clock[0] += 5
+        await cache.set("new", "value")
+        clock[0] += 6
+        
+        assert await cache.cleanup_expired() == 1
+        assert await cache.get("old") is None
+        assert await cache.get("new") == "value"
+
+
+class TestFileCachePaths:
+    """Tests for FileCache path derivation."""
+    
+    @pytest.mark.parametrize("key", [
+        "https://example.com/pkg?x=1&y=2",
+        "a" * 300,
+    ])
+    def test_get_paths_matches_separate_helpers(self, tmp_path, key):
+        """Test _get_paths agrees with _get_path and _get_meta_path."""
+        cache = FileCache(tmp_path)
+        
+        assert cache._get_paths(key) == (cache._get_path(key), cache._get_meta_path(key))
+
+
+class TestFileCacheIndex:
+    """Tests for FileCache's in-memory index of entries."""
+    
+    @pytest.mark.asyncio
+    async def test_miss_skips_filesystem(self, tmp_path, monkeypatch):
+        """Test a miss is answered from the index without an exists() call."""
+        cache = FileCache(tmp_path)
+        await cache.set("present", b"data")
+        
+        async def fail_exists(path):
+            raise AssertionError(f"unexpected exists({path})")
+        
+        monkeypatch.setattr(cache_module.aiofiles.os.path, "exists", fail_exists)
+        assert await cache.get("absent") is None
+    
+    @pytest.mark.asyncio
+    async def test_set_get_remove(self, tmp_path):
+        """Test the index follows set and remove."""
+        cache = FileCache(tmp_path)
+        
+        path = await cache.set("key1", b"value1")
+        entry = await cache.get("key1")
+        assert entry.url == "key1"
+        assert entry.path == path
+        assert path.read_bytes() == b"value1"
+        
+        assert await cache.remove("key1") is True
+        assert await cache.get("key1") is None
+    
+    @pytest.mark.asyncio
+    async def test_new_instance_lists_existing_entries(self, tmp_path):
+        """Test entries written earlier are found by a new instance."""
+        await FileCache(tmp_path).set("key1", b"value1")
+        
+        entry = await FileCache(tmp_path).get("key1")
+        assert entry is not None
+        assert entry.path.read_bytes() == b"value1"
+    
+    @pytest.mark.asyncio
+    async def test_entries_written_elsewhere_found_after_index_ttl(self, tmp_path, monkeypatch):
+        """Test a stale listing is refreshed on a miss."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module, "_monotonic", lambda: now[0])
+        reader = FileCache(tmp_path, index_ttl=timedelta(seconds=5))
+        assert await reader.get("key1") is None
+        
+        await FileCache(tmp_path).set("key1", b"value1")
+        assert await reader.get("key1") is None
+        
+        now[0] += 5
+        entry = await reader.get("key1")
+        assert entry is not None
+        assert entry.path.read_bytes() == b"value1"
+    
+    @pytest.mark.asyncio
+    async def test_clear_resets_index(self, tmp_path):
+        """Test entries are gone after clear and can be stored again."""
+        cache = FileCache(tmp_path)
+        await cache.set("key1", b"value1")
+        
+        assert await cache.clear() == 2
+        assert await cache.get("key1") is None
+        
+        await cache.set("key1", b"value2")
+        assert (await cache.get("key1")).path.read_bytes() == b"value2"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+"""
+Tests for GitHubProcessor's conditional (ETag) requests.
+"""
+
+import pytest
+import httpx
+
+from llamapackageservice.processors import github as github_module
+from llamapackageservice.processors.github import GitHubProcessor
+
+
+class TestGitHubConditionalGet:
+    """Tests for GitHubProcessor's ETag revalidation."""
+    
+    @staticmethod
+    def _client(handler):
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    @pytest.mark.asyncio
+    async def test_not_modified_returns_cached_response(self):
+        """Test a 304 is answered with the cached response."""
+        seen = []
+        
+        def handler(request):
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"name": "repo"}, headers={"ETag": '"v1"'})
+        
+        processor = GitHubProcessor()
+        async with self._client(handler) as client:
+            first = await processor._conditional_get(client, "https://api.github.com/repos/o/r")
+            second = await processor._conditional_get(client, "https://api.github.com/repos/o/r")
+        
+        assert seen == [None, '"v1"']
+        assert second is first
+        assert second.json() == {"name": "repo"}
+    
+    @pytest.mark.asyncio
+    async def test_changed_resource_replaces_cached_response(self):
+        """Test a fresh 200 replaces the cached copy."""
+        versions = iter(['"v1"', '"v2"'])
+        
+        def handler(request):
+            etag = next(versions)
+            return httpx.Response(200, json={"etag": etag}, headers={"ETag": etag})
+        
+        processor = GitHubProcessor()
+        async with self._client(handler) as client:
+            await processor._conditional_get(client, "https://api.github.com/repos/o/r")
+            second = await processor._conditional_get(client, "https://api.github.com/repos/o/r")
+        
+        assert second.json() == {"etag": '"v2"'}
+        assert list(processor._conditional_cache.values()) == [second]
+    
+    @pytest.mark.asyncio
+    async def test_params_are_part_of_the_key(self):
+        """Test different query parameters are cached separately."""
+        def handler(request):
+            assert "if-none-match" not in request.headers
+            return httpx.Response(200, json={}, headers={"ETag": str(request.url)})
+        
+        processor = GitHubProcessor()
+        async with self._client(handler) as client:
+            for page in (1, 2):
+                await processor._conditional_get(
+                    client, "https://api.github.com/repos/o/r/contents", {"page": page}
+                )
+        
+        assert len(processor._conditional_cache) == 2
+    
+    @pytest.mark.asyncio
+    async def test_errors_and_unvalidated_responses_are_not_cached(self):
+        """Test only successful responses with a validator are cached."""
+        responses = iter([httpx.Response(404), httpx.Response(200, json={})])
+        
+        processor = GitHubProcessor()
+        async with self._client(lambda request: next(responses)) as client:
+            await processor._conditional_get(client, "https://api.github.com/a")
+            await processor._conditional_get(client, "https://api.github.com/b")
+        
+        assert processor._conditional_cache == {}
+    
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, monkeypatch):
+        """Test the oldest response is dropped once the cache is full."""
+        monkeypatch.setattr(github_module, "CONDITIONAL_CACHE_SIZE", 2)
+        
+        def handler(request):
+            return httpx.Response(200, json={}, headers={"ETag": '"v"'})
+        
+        processor = GitHubProcessor()
+        async with self._client(handler) as client:
+            for name in ("a", "b", "c"):
+                await processor._conditional_get(client, f"https://api.github.com/{name}")
+        
+        assert list(processor._conditional_cache) == [
+            "https://api.github.com/b",
+            "https://api.github.com/c",
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])